@@ -0,0 +1,159 @@
+"""Benchmark the CPU cost of computing all sensor values for one update.
+
+Compares the per-sensor evaluation that sensor.py did before the derivation
+stage, over the sensors it had, with deriving the whole value table once per
+coordinator update for the current sensor set. The sensor counts and timings
+are printed, they depend on the machine and on the sensors of this version:
+
+    python benchmarks/bench_derive.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.payloads import node_payloads
+from custom_components.storj_node_statistics.derive import derive_values
+from custom_components.storj_node_statistics.models import PARSERS
+from custom_components.storj_node_statistics.sensor import ENTITY_DESCRIPTIONS
+
+ROUNDS = 2000
+
+# The sensors of sensor.py before the derivation stage
+LEGACY_KEYS = (
+    "storj_diskspace_available",
+    "storj_diskspace_used",
+    "storj_diskspace_trash",
+    "storj_diskspace_free",
+    "storj_average_usage_bytes",
+    "storj_disk_use_percentage",
+    "storj_nodeid",
+    "storj_wallet",
+    "storj_quic",
+    "storj_uptime",
+    "storj_version",
+    "storj_bandwidth_used",
+    "storj_bandwidth_egress",
+    "storj_bandwidth_ingress",
+    "storj_current_month_payout",
+    "storj_current_month_held",
+    "storj_current_month_pay_total",
+    "storj_satellite_avg_online",
+    "storj_total_held",
+    "storj_total_earned",
+)
+
+
+def legacy_native_value(data: dict[str, Any], key: str) -> Any:
+    """Return a sensor value the way each sensor computed it before."""
+    disk_total = data["sno"].get("diskSpace", {}).get("allocated")
+    disk_available = data["sno"].get("diskSpace", {}).get("available")
+    disk_used = data["sno"].get("diskSpace", {}).get("used")
+    disk_trash = data["sno"].get("diskSpace", {}).get("trash")
+    payout = data["estimated-payout"].get("currentMonth", {}).get("payout")
+    held = data["estimated-payout"].get("currentMonth", {}).get("held")
+    if key == "storj_diskspace_available":
+        return round(float(disk_total / 1000000000), 2)
+    if key == "storj_diskspace_used":
+        return round(float(disk_used / 1000000000), 2)
+    if key == "storj_diskspace_trash":
+        return round(float(disk_trash / 1000000000), 2)
+    if key == "storj_diskspace_free":
+        return round(float(disk_available / 1000000000), 2)
+    if key == "storj_average_usage_bytes":
+        return round(float(data["satellites"]["averageUsageBytes"] / 1000000000), 2)
+    if key == "storj_disk_use_percentage":
+        return round(float((disk_total - disk_available) / disk_total * 100), 2)
+    if key == "storj_wallet":
+        return data["sno"].get("wallet")
+    if key == "storj_quic":
+        return data["sno"].get("quicStatus")
+    if key == "storj_uptime":
+        started_at = datetime.fromisoformat(
+            data["sno"]["startedAt"].replace("Z", "+00:00")
+        )
+        uptime = datetime.now(UTC) - started_at
+        hours, remainder = divmod(uptime.seconds, 3600)
+        return f"{uptime.days}d {hours}h {remainder // 60}m"
+    if key == "storj_version":
+        return data["sno"].get("version")
+    if key == "storj_bandwidth_used":
+        return round(float(data["sno"]["bandwidth"]["used"] / 1000000000), 2)
+    if key == "storj_bandwidth_egress":
+        return round(float(data["satellites"]["egressSummary"] / 1000000000), 2)
+    if key == "storj_bandwidth_ingress":
+        return round(float(data["satellites"]["ingressSummary"] / 1000000000), 2)
+    if key == "storj_nodeid":
+        return data["sno"].get("nodeID")
+    if key == "storj_current_month_payout":
+        return round(float(payout / 100), 2)
+    if key == "storj_current_month_held":
+        return round(float(held / 100), 2)
+    if key == "storj_current_month_pay_total":
+        return round(float((payout + held) / 100), 2)
+    if key == "storj_satellite_avg_online":
+        audits = data["satellites"].get("audits", [])
+        return round(
+            float(sum(a["onlineScore"] for a in audits) / len(audits) * 100), 2
+        )
+    if key == "storj_total_held":
+        total = sum(item["totalHeld"] for item in data["held_history"])
+        return round(float(total / 1000000), 2)
+    if key == "storj_total_earned":
+        total = sum(item["paid"] for item in data["paystubs"])
+        return round(float(total / 1000000), 2)
+    return None
+
+
+def _per_update(function: Any) -> float:
+    """Return the CPU time in microseconds of one call, averaged over rounds."""
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        function()
+    return (time.process_time() - start) / ROUNDS * 1e6
+
+
+def main() -> None:
+    """Run the benchmark."""
+    data = node_payloads(months=36)
+    # Responses are parsed once per fetch, before the derivation stage
+    records = {
+        key: PARSERS[key](payload)
+        for key, payload in data.items()
+        if key != "satellite"
+    }
+    records["satellite"] = {
+        satellite_id: PARSERS["satellite"](payload)
+        for satellite_id, payload in data["satellite"].items()
+    }
+    keys = [description.key for description in ENTITY_DESCRIPTIONS]
+
+    def legacy() -> None:
+        for key in LEGACY_KEYS:
+            legacy_native_value(data, key)
+
+    def derived() -> None:
+        # The history cache keeps the running total, open paystubs are few
+        values = derive_values(records, 0)
+        for key in keys:
+            values.get(key)
+
+    before = _per_update(legacy)
+    after = _per_update(derived)
+    print(f"{len(data['paystubs'])} paystubs")
+    print(
+        f"per-sensor evaluation: {before:8.1f} us per update, "
+        f"{len(LEGACY_KEYS)} sensors"
+    )
+    print(f"derived value table:   {after:8.1f} us per update, {len(keys)} sensors")
+    print(f"ratio:                 {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Benchmark coordinator refreshes against stand-in storage nodes.
+
+Starts 1, 10 and 100 fake nodes in a separate process, so their CPU use is
+not counted, and measures for the coordinators polling them:
+
+- wall-clock latency of refreshing every node, and per node (p50/p95)
+- CPU time of the Home Assistant process per node update
+- memory kept per coordinator after its refreshes, responses it still caches
+  included
+
+    python benchmarks/bench_refresh.py --latency 0.05 --rounds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.storj_node_statistics import api
+from custom_components.storj_node_statistics.api import IntegrationBlueprintApiClient
+from custom_components.storj_node_statistics.const import DOMAIN, ENDPOINTS, LOGGER
+from custom_components.storj_node_statistics.coordinator import (
+    BlueprintDataUpdateCoordinator,
+)
+
+FAKE_NODE = Path(__file__).with_name("fake_node.py")
+# Every endpoint is due on every refresh, so each round is a full refresh
+FULL_REFRESH = {key: timedelta(0) for key in ENDPOINTS}
+
+
+async def _wait_for_port(port: int, timeout: float = 30) -> None:
+    """Wait until a stand-in node accepts connections."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+        else:
+            writer.close()
+            return
+
+
+async def _timed_refresh(
+    coordinator: BlueprintDataUpdateCoordinator,
+) -> tuple[float, bool]:
+    """Refresh a coordinator and return how long it took and if it succeeded."""
+    start = time.perf_counter()
+    await coordinator.async_refresh()
+    return time.perf_counter() - start, coordinator.last_update_success
+
+
+async def run(nodes: int, args: argparse.Namespace) -> None:
+    """Benchmark one fleet size."""
+    server = await asyncio.create_subprocess_exec(
+        sys.executable,
+        str(FAKE_NODE),
+        f"--nodes={nodes}",
+        f"--port={args.port}",
+        f"--latency={args.latency}",
+        f"--jitter={args.jitter}",
+        f"--error-rate={args.error_rate}",
+        f"--satellites={args.satellites}",
+        f"--days={args.days}",
+        f"--months={args.months}",
+        stdout=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        for index in range(nodes):
+            await _wait_for_port(args.port + index)
+        with tempfile.TemporaryDirectory() as config_dir:
+            hass = HomeAssistant(config_dir)
+            connector = aiohttp.TCPConnector(limit=args.max_concurrent * 8)
+            async with aiohttp.ClientSession(connector=connector) as session:
+                await _measure(hass, session, nodes, args)
+            await hass.async_stop(force=True)
+    finally:
+        server.terminate()
+        await server.wait()
+
+
+async def _measure(
+    hass: HomeAssistant,
+    session: aiohttp.ClientSession,
+    nodes: int,
+    args: argparse.Namespace,
+) -> None:
+    """Refresh the coordinators of a fleet and print the measurements."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    semaphore = asyncio.Semaphore(args.max_concurrent)
+    coordinators = [
+        BlueprintDataUpdateCoordinator(
+            hass=hass,
+            logger=LOGGER,
+            name=f"{DOMAIN} node {index}",
+            client=IntegrationBlueprintApiClient(
+                host="127.0.0.1", port=args.port + index, session=session
+            ),
+            refresh_intervals=FULL_REFRESH,
+            semaphore=semaphore,
+        )
+        for index in range(nodes)
+    ]
+
+    fleet_latencies = []
+    node_latencies: list[float] = []
+    failed = 0
+    cpu = 0.0
+    for round_ in range(args.rounds):
+        if round_:
+            # Every round requests the nodes instead of reusing the responses
+            # of the previous one, with the cache as configured
+            await asyncio.sleep(api.DEFAULT_MAX_AGE)
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        results = await asyncio.gather(*(_timed_refresh(c) for c in coordinators))
+        fleet_latencies.append(time.perf_counter() - start)
+        cpu += time.process_time() - cpu_start
+        node_latencies.extend(latency for latency, _ in results)
+        failed += sum(not success for _, success in results)
+
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    quantiles = statistics.quantiles(node_latencies, n=20)
+    print(
+        f"{nodes:>5} nodes"
+        f" | fleet refresh {statistics.median(fleet_latencies) * 1000:8.1f} ms"
+        f" | node p50 {statistics.median(node_latencies) * 1000:7.1f} ms"
+        f" p95 {quantiles[18] * 1000:7.1f} ms"
+        f" | cpu/update {cpu / (args.rounds * nodes) * 1000:6.2f} ms"
+        f" | memory/coordinator {retained / nodes / 1024:7.1f} kB"
+        f" | failed updates {failed}"
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fleet", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--port", type=int, default=24002)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--max-concurrent", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--satellites", type=int, default=4)
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--months", type=int, default=36)
+    return parser.parse_args()
+
+
+async def main() -> None:
+    """Run the benchmark for every fleet size."""
+    args = parse_args()
+    # Failed updates are counted instead of logging every failed endpoint
+    LOGGER.setLevel(logging.ERROR)
+    for nodes in args.fleet:
+        await run(nodes, args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,187 @@
+"""Stand-in storage nodes serving the dashboard API for benchmarks.
+
+Every node listens on its own port and serves the payloads of
+benchmarks/payloads.py for every path the coordinator uses, with
+configurable latency, error rate and payload sizes. The debug metrics
+endpoint is served on the same port at /metrics from a metrics file.
+
+    python benchmarks/fake_node.py --nodes 10 --port 14002 --latency 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks import payloads
+
+# Sample output of the storagenode debug endpoint in Prometheus text format
+METRICS_FILE = Path(__file__).with_name("storagenode_metrics.txt")
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+
+@dataclass
+class FakeNodeConfig:
+    """Behaviour of a stand-in node."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    satellites: int = 4
+    days: int = 31
+    months: int = 36
+    metrics: Path = METRICS_FILE
+
+
+def _period_index(period: str) -> int:
+    """Return the month index of a "YYYY-M" or "YYYY-MM" period."""
+    year, month = period.split("-")[:2]
+    return int(year) * 12 + int(month) - 1
+
+
+class FakeNode:
+    """One stand-in storage node."""
+
+    def __init__(self, index: int, config: FakeNodeConfig) -> None:
+        """Build and encode the payloads of the node once."""
+        self.config = config
+        self.requests = 0
+        node = payloads.node_payloads(
+            index, config.satellites, config.days, config.months
+        )
+        self._responses = {
+            "/api/sno/": json.dumps(node["sno"]).encode(),
+            "/api/sno/satellites": json.dumps(node["satellites"]).encode(),
+            "/api/sno/estimated-payout": json.dumps(node["estimated-payout"]).encode(),
+            "/api/heldamount/held-history": json.dumps(node["held_history"]).encode(),
+        }
+        self._satellites = {
+            satellite_id: json.dumps(payload).encode()
+            for satellite_id, payload in node["satellite"].items()
+        }
+        self._paystubs = node["paystubs"]
+        self._metrics = config.metrics.read_bytes()
+
+    @web.middleware
+    async def _behaviour(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        """Apply the configured latency and error rate to every request."""
+        self.requests += 1
+        delay = self.config.latency + random.uniform(0, self.config.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if random.random() < self.config.error_rate:
+            raise web.HTTPInternalServerError
+        return await handler(request)
+
+    async def _static(self, request: web.Request) -> web.Response:
+        """Serve a fixed payload."""
+        return web.Response(
+            body=self._responses[request.path], content_type="application/json"
+        )
+
+    async def _satellite(self, request: web.Request) -> web.Response:
+        """Serve the payload of one satellite."""
+        if (body := self._satellites.get(request.match_info["id"])) is None:
+            raise web.HTTPNotFound
+        return web.Response(body=body, content_type="application/json")
+
+    async def _paystubs_range(self, request: web.Request) -> web.Response:
+        """Serve the paystubs of a period range."""
+        start = _period_index(request.match_info["start"])
+        end = _period_index(request.match_info["end"])
+        return web.json_response(
+            [
+                paystub
+                for paystub in self._paystubs
+                if start <= _period_index(paystub["period"]) <= end
+            ]
+        )
+
+    async def _metrics_text(self, _request: web.Request) -> web.Response:
+        """Serve the debug metrics."""
+        return web.Response(body=self._metrics, content_type="text/plain")
+
+    def app(self) -> web.Application:
+        """Return the web application of the node."""
+        app = web.Application(middlewares=[self._behaviour])
+        for path in self._responses:
+            app.router.add_get(path, self._static)
+        app.router.add_get("/api/sno/satellite/{id}", self._satellite)
+        app.router.add_get(
+            "/api/heldamount/paystubs/{start}/{end}", self._paystubs_range
+        )
+        app.router.add_get("/metrics", self._metrics_text)
+        return app
+
+
+async def start_nodes(
+    count: int, port: int, config: FakeNodeConfig, host: str = "127.0.0.1"
+) -> tuple[list[FakeNode], list[web.AppRunner]]:
+    """Start nodes on consecutive ports and return them with their runners."""
+    nodes = [FakeNode(index, config) for index in range(count)]
+    runners = []
+    for index, node in enumerate(nodes):
+        runner = web.AppRunner(node.app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port + index).start()
+        runners.append(runner)
+    return nodes, runners
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Serve nodes until interrupted."""
+    config = FakeNodeConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        satellites=args.satellites,
+        days=args.days,
+        months=args.months,
+        metrics=args.metrics,
+    )
+    await start_nodes(args.nodes, args.port, config, args.host)
+    print(
+        f"Serving {args.nodes} nodes on {args.host}:{args.port}"
+        f"-{args.port + args.nodes - 1}",
+        flush=True,
+    )
+    await asyncio.Event().wait()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=14002)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--satellites", type=int, default=4)
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--months", type=int, default=36)
+    parser.add_argument("--metrics", type=Path, default=METRICS_FILE)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_serve(parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,255 @@
+"""Realistic storage node API payloads for benchmarks.
+
+The payloads follow the shape of responses recorded from a storagenode
+dashboard API, scaled by the number of satellites, days and payout months.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+SATELLITES = (
+    ("121RTSDpyNZVcEU84Ticf2L1ntiuUimbWgfATz21tuvgk3vzoA6", "ap1.storj.io:7777"),
+    ("12EayRS2V1kEsWESU9QMRseFhdxYxKicsiFmxrsLZHeLUtdps3S", "us1.storj.io:7777"),
+    ("12L9ZFwhzVpuEKMUNUqkaTLGzwY9G24tbiigLiXpmZWKwmcNDDs", "eu1.storj.io:7777"),
+    (
+        "1wFTAgs9DP5RSnCqKV1eLf6N9wtk4EAtmN5DpSxcs8EjT69tGE",
+        "saltlake.tardigrade.io:7777",
+    ),
+)
+
+
+def node_id(index: int) -> str:
+    """Return a stable fake node ID for a node index."""
+    return "1" + hashlib.sha256(f"node-{index}".encode()).hexdigest()[:49]
+
+
+def satellite_ids(count: int) -> list[tuple[str, str]]:
+    """Return IDs and URLs of the given number of satellites."""
+    satellites = list(SATELLITES[:count])
+    satellites.extend(
+        (f"1fake{index:046d}", f"satellite{index}.example.com:7777")
+        for index in range(len(satellites), count)
+    )
+    return satellites
+
+
+def _day(now: datetime, day: int) -> str:
+    """Return the start of a day of the current month in API format."""
+    start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return (start + timedelta(days=day)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def sno(index: int = 0, satellites: int = 4) -> dict[str, Any]:
+    """Return a /api/sno/ payload."""
+    now = datetime.now(UTC)
+    return {
+        "nodeID": node_id(index),
+        "wallet": "0x" + hashlib.sha256(f"wallet-{index}".encode()).hexdigest()[:40],
+        "walletFeatures": ["zksync-era"],
+        "satellites": [
+            {
+                "id": satellite_id,
+                "url": url,
+                "disqualified": None,
+                "suspended": None,
+                "vettedAt": "2023-03-01T10:00:00Z",
+                "currentStorageUsed": 1500000000000 + index,
+            }
+            for satellite_id, url in satellite_ids(satellites)
+        ],
+        "diskSpace": {
+            "used": 6512345678901,
+            "available": 1487654321099,
+            "trash": 45678901234,
+            "overused": 0,
+            "allocated": 8000000000000,
+        },
+        "bandwidth": {"used": 912345678901, "available": 0},
+        "lastPinged": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "version": "1.104.5",
+        "allowedVersion": "1.100.0",
+        "upToDate": True,
+        "startedAt": (now - timedelta(days=3, hours=4)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "configuredPort": "28967",
+        "quicStatus": "OK",
+        "lastQuicPingedAt": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+
+def satellites_summary(satellites: int = 4, days: int = 31) -> dict[str, Any]:
+    """Return a /api/sno/satellites payload with the given number of days."""
+    now = datetime.now(UTC)
+    rng = random.Random(days)
+    storage_daily = [
+        {
+            "atRestTotal": 150000000000000 + rng.random() * 1e13,
+            "atRestTotalBytes": 6200000000000 + day * 9000000000,
+            "intervalStart": _day(now, day),
+        }
+        for day in range(days)
+    ]
+    bandwidth_daily = [
+        {
+            "egress": {
+                "repair": rng.randrange(1000000000, 5000000000),
+                "audit": rng.randrange(1000000, 5000000),
+                "usage": rng.randrange(10000000000, 40000000000),
+            },
+            "ingress": {
+                "repair": rng.randrange(1000000000, 3000000000),
+                "usage": rng.randrange(5000000000, 20000000000),
+            },
+            "delete": 0,
+            "intervalStart": _day(now, day),
+        }
+        for day in range(days)
+    ]
+    egress = sum(sum(item["egress"].values()) for item in bandwidth_daily)
+    ingress = sum(sum(item["ingress"].values()) for item in bandwidth_daily)
+    return {
+        "storageDaily": storage_daily,
+        "bandwidthDaily": bandwidth_daily,
+        "storageSummary": sum(item["atRestTotal"] for item in storage_daily),
+        "averageUsageBytes": 6300000000000.0,
+        "bandwidthSummary": egress + ingress,
+        "egressSummary": egress,
+        "ingressSummary": ingress,
+        "earliestJoinedAt": "2023-02-27T12:00:00Z",
+        "audits": [
+            {
+                "auditScore": 1,
+                "suspensionScore": 1,
+                "onlineScore": 0.995 - index * 0.001,
+                "satelliteName": url,
+            }
+            for index, (_, url) in enumerate(satellite_ids(satellites))
+        ],
+    }
+
+
+def satellite(satellite_id: str, url: str, days: int = 31) -> dict[str, Any]:
+    """Return a /api/sno/satellite/{id} payload."""
+    summary = satellites_summary(satellites=1, days=days)
+    audits = summary.pop("audits")[0]
+    return {
+        "id": satellite_id,
+        **summary,
+        "audits": {**audits, "satelliteName": url},
+        "auditHistory": {
+            "score": 1,
+            "threshold": 0.6,
+            "windows": [
+                {
+                    "windowStart": _day(datetime.now(UTC), day),
+                    "totalCount": 48,
+                    "onlineCount": 48,
+                }
+                for day in range(days)
+            ],
+        },
+        "priceModel": {
+            "EgressBandwidth": 200,
+            "RepairBandwidth": 200,
+            "AuditBandwidth": 200,
+            "DiskSpace": 150,
+        },
+        "nodeJoinedAt": "2023-02-27T12:00:00Z",
+    }
+
+
+def estimated_payout() -> dict[str, Any]:
+    """Return a /api/sno/estimated-payout payload."""
+    month = {
+        "egressBandwidth": 812345678901,
+        "egressBandwidthPayout": 162.47,
+        "egressRepairAudit": 98765432101,
+        "egressRepairAuditPayout": 19.75,
+        "diskSpace": 4400000000000000,
+        "diskSpacePayout": 915.32,
+        "heldRate": 0,
+        "payout": 1097.54,
+        "held": 0,
+    }
+    return {
+        "currentMonth": month,
+        "previousMonth": {**month, "payout": 1534.1},
+        "currentMonthExpectations": 1612.0,
+    }
+
+
+def held_history(satellites: int = 4) -> list[dict[str, Any]]:
+    """Return a /api/heldamount/held-history payload."""
+    return [
+        {
+            "satelliteID": satellite_id,
+            "satelliteName": url,
+            "holdForFirstPeriod": 1234567,
+            "holdForSecondPeriod": 617283,
+            "holdForThirdPeriod": 308641,
+            "totalHeld": 2160491,
+            "totalDisposed": 1080245,
+            "joinedAt": "2023-02-27T12:00:00Z",
+        }
+        for satellite_id, url in satellite_ids(satellites)
+    ]
+
+
+def paystubs(satellites: int = 4, months: int = 36) -> list[dict[str, Any]]:
+    """Return a /api/heldamount/paystubs payload covering the given months."""
+    now = datetime.now(UTC)
+    current = now.year * 12 + now.month - 1
+    items = []
+    for month in range(current - months, current):
+        year, month_index = divmod(month, 12)
+        items.extend(
+            {
+                "satelliteId": satellite_id,
+                "period": f"{year}-{month_index + 1:02d}",
+                "created": f"{year}-{month_index + 1:02d}-28T00:00:00Z",
+                "codes": "",
+                "usageAtRest": 1234567890123.4,
+                "usageGet": 123456789012,
+                "usagePut": 0,
+                "usageGetRepair": 1234567890,
+                "usagePutRepair": 0,
+                "usageGetAudit": 1234567,
+                "compAtRest": 1851851,
+                "compGet": 2469135,
+                "compPut": 0,
+                "compGetRepair": 24691,
+                "compPutRepair": 0,
+                "compGetAudit": 24,
+                "surgePercent": 0,
+                "held": 0,
+                "owed": 4345701,
+                "disposed": 0,
+                "paid": 4345701,
+                "distributed": 4345701,
+            }
+            for satellite_id, _ in satellite_ids(satellites)
+        )
+    return items
+
+
+def node_payloads(
+    index: int = 0, satellites: int = 4, days: int = 31, months: int = 36
+) -> dict[str, Any]:
+    """Return the payload of every coordinator endpoint, keyed like its data.
+
+    Per-satellite payloads are keyed by satellite ID under "satellite".
+    """
+    return {
+        "sno": sno(index, satellites),
+        "satellites": satellites_summary(satellites, days),
+        "satellite": {
+            satellite_id: satellite(satellite_id, url, days)
+            for satellite_id, url in satellite_ids(satellites)
+        },
+        "estimated-payout": estimated_payout(),
+        "held_history": held_history(satellites),
+        "paystubs": paystubs(satellites, months),
+    }
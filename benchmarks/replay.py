@@ -0,0 +1,95 @@
+"""Replay a capture of node API traffic through a coordinator.
+
+Captures are written by the "Capture the node API traffic" option to
+<config>/storj_node_statistics/captures/<host-port>.jsonl.gz. Every captured
+refresh is replayed through a coordinator without any network, as fast as
+possible by default to profile parsing and deriving the sensor values, or
+at a multiple of the captured pace:
+
+    python benchmarks/replay.py capture.jsonl.gz --speed 60
+    python -m cProfile -s cumtime benchmarks/replay.py capture.jsonl.gz
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.storj_node_statistics.capture import (
+    ReplayClient,
+    async_replay,
+    read_capture,
+)
+from custom_components.storj_node_statistics.const import DOMAIN, ENDPOINTS, LOGGER
+from custom_components.storj_node_statistics.coordinator import (
+    BlueprintDataUpdateCoordinator,
+)
+
+# Every endpoint is due on every refresh, each answered as it was captured
+FULL_REFRESH = {key: timedelta(0) for key in ENDPOINTS}
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Replay the capture and print the measurements."""
+    records = read_capture(args.capture)
+    client = ReplayClient(args.capture.name, records, speed=args.speed)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        coordinator = BlueprintDataUpdateCoordinator(
+            hass=hass,
+            logger=LOGGER,
+            name=f"{DOMAIN} replay",
+            client=client,
+            refresh_intervals=FULL_REFRESH,
+            semaphore=asyncio.Semaphore(1),
+        )
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        failures = await async_replay(coordinator, client, args.speed)
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu_start
+        await hass.async_stop(force=True)
+
+    updates = len(client.update_times())
+    print(
+        f"{len(records)} records | {updates} refreshes in {elapsed:.2f} s"
+        f" | cpu/update {cpu / max(updates, 1) * 1000:.2f} ms"
+        f" | failed updates {failures}"
+    )
+    if coordinator.data is not None:
+        for key, value in sorted(coordinator.values.items()):
+            print(f"  {key}: {value}")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", type=Path)
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=None,
+        help="times the captured pace, as fast as possible if not set",
+    )
+    return parser.parse_args()
+
+
+async def main() -> None:
+    """Replay a capture."""
+    args = parse_args()
+    LOGGER.setLevel(logging.ERROR)
+    await run(args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
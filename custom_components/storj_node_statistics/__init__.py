@@ -6,27 +6,71 @@ https://github.com/ledimestari/homeassistant-storj-integration
 
 from __future__ import annotations
 
+import asyncio
+import random
 from datetime import timedelta
+from functools import partial
+from pathlib import Path
 from typing import TYPE_CHECKING
 
+from homeassistant.components import webhook
 from homeassistant.const import CONF_HOST, CONF_PORT, Platform
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import HassJob, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_call_later
 from homeassistant.loader import async_get_loaded_integration
-
-from .api import IntegrationBlueprintApiClient
-from .const import DOMAIN, LOGGER
-from .coordinator import BlueprintDataUpdateCoordinator
-from .data import IntegrationBlueprintData
+from slugify import slugify
+
+from .capture import CaptureWriter
+from .const import (
+    CONF_CAPTURE,
+    CONF_MAX_CONCURRENT,
+    CONF_METRICS,
+    CONF_METRICS_PORT,
+    CONF_NODES,
+    CONF_PUSH,
+    CONF_RULES,
+    CONF_WEBHOOK_ID,
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_METRICS,
+    DEFAULT_REFRESH_INTERVALS,
+    DEFAULT_RULES,
+    DOMAIN,
+    LOGGER,
+)
+from .coordinator import BlueprintDataUpdateCoordinator, async_remove_stores
+from .data import (
+    IntegrationBlueprintData,
+    async_get_client,
+    async_release_client,
+)
+from .push import async_register_webhook
+from .rules import parse_rule
+from .services import async_setup_services
+from .websocket_api import async_setup_websocket_api
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
+    from .api import IntegrationBlueprintApiClient
     from .data import IntegrationBlueprintConfigEntry
 
 PLATFORMS: list[Platform] = [
     Platform.SENSOR,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, _config: ConfigType) -> bool:
+    """Set up the services and WebSocket API, which serve every entry."""
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    return True
+
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(
@@ -34,24 +78,68 @@ async def async_setup_entry(
     entry: IntegrationBlueprintConfigEntry,
 ) -> bool:
     """Set up this integration using UI."""
-    coordinator = BlueprintDataUpdateCoordinator(
-        hass=hass,
-        logger=LOGGER,
-        name=DOMAIN,
-        update_interval=timedelta(minutes=10),  # update sensors every 10 minutes
+    if CONF_WEBHOOK_ID not in entry.data:
+        # Collectors push the data of nodes to this webhook of the entry
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_WEBHOOK_ID: webhook.async_generate_id()}
+        )
+    pushed = set(entry.options.get(CONF_PUSH, []))
+    # A fleet entry lists its nodes, a single node entry is a fleet of one
+    nodes = entry.data.get(CONF_NODES, [entry.data])
+    refresh_intervals = {
+        key: timedelta(minutes=entry.options.get(key, default))
+        for key, default in DEFAULT_REFRESH_INTERVALS.items()
+    }
+    semaphore = asyncio.Semaphore(
+        entry.data.get(CONF_MAX_CONCURRENT, DEFAULT_MAX_CONCURRENT)
     )
+    rules = [parse_rule(rule) for rule in entry.options.get(CONF_RULES, DEFAULT_RULES)]
+    coordinators = []
+    for node in nodes:
+        client = async_get_client(hass, node[CONF_HOST], node[CONF_PORT])
+        entry.async_on_unload(partial(async_release_client, hass, client.target, entry))
+        if entry.options.get(CONF_CAPTURE):
+            _async_start_capture(hass, entry, client)
+        coordinators.append(
+            BlueprintDataUpdateCoordinator(
+                hass=hass,
+                logger=LOGGER,
+                name=f"{DOMAIN} {client.target}",
+                client=client,
+                refresh_intervals=refresh_intervals,
+                semaphore=semaphore,
+                metrics_port=entry.options.get(CONF_METRICS_PORT),
+                metric_selectors=list(entry.options.get(CONF_METRICS, DEFAULT_METRICS)),
+                rules=rules,
+                push=client.target in pushed,
+            )
+        )
     entry.runtime_data = IntegrationBlueprintData(
-        client=IntegrationBlueprintApiClient(
-            host=entry.data[CONF_HOST],
-            port=entry.data[CONF_PORT],
-            session=async_get_clientsession(hass),
-        ),
+        coordinators=coordinators,
         integration=async_get_loaded_integration(hass, entry.domain),
-        coordinator=coordinator,
     )
 
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
+    await asyncio.gather(*(coordinator.async_restore() for coordinator in coordinators))
+    if pushed:
+        async_register_webhook(hass, entry)
+
+    polled = [coordinator for coordinator in coordinators if not coordinator.push]
+    if CONF_NODES in entry.data or not polled:
+        # Nodes of a fleet get their sensors from their restored data or once
+        # they answer, so one slow or offline node does not hold back the
+        # others. Pushed nodes get them once their first snapshot arrives
+        _async_schedule_staggered_refreshes(hass, entry, polled)
+    elif coordinators[0].data is not None:
+        # The sensors are created from the restored data, so the node does not
+        # have to answer before setup completes
+        entry.async_create_background_task(
+            hass,
+            coordinators[0].async_refresh(),
+            f"{coordinators[0].name} first refresh",
+        )
+    else:
+        # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+        await coordinators[0].async_config_entry_first_refresh()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
@@ -59,6 +147,70 @@ async def async_setup_entry(
     return True
 
 
+@callback
+def _async_start_capture(
+    hass: HomeAssistant,
+    entry: IntegrationBlueprintConfigEntry,
+    client: IntegrationBlueprintApiClient,
+) -> None:
+    """
+    Capture the traffic of a node until the entry is unloaded.
+
+    A capture belongs to the node, not the entry, as the client of a node is
+    shared. A node is in one entry only, a capture that is still running is
+    kept rather than replaced.
+    """
+    if client.capture is not None:
+        LOGGER.warning("Already capturing %s to %s", client.target, client.capture.path)
+        return
+    capture = CaptureWriter(
+        Path(hass.config.path(DOMAIN, "captures", f"{slugify(client.target)}.jsonl.gz"))
+    )
+    client.capture = capture
+
+    @callback
+    def _async_stop_capture() -> None:
+        if client.capture is capture:
+            client.capture = None
+        capture.close()
+
+    entry.async_on_unload(_async_stop_capture)
+
+
+@callback
+def _async_schedule_staggered_refreshes(
+    hass: HomeAssistant,
+    entry: IntegrationBlueprintConfigEntry,
+    coordinators: list[BlueprintDataUpdateCoordinator],
+) -> None:
+    """Spread the first refresh of the fleet nodes over one update interval."""
+    if not coordinators:
+        return
+    tick = coordinators[0].update_interval.total_seconds()
+    slot = tick / len(coordinators)
+    for index, coordinator in enumerate(coordinators):
+
+        @callback
+        def _async_refresh(
+            _now: datetime,
+            coordinator: BlueprintDataUpdateCoordinator = coordinator,
+        ) -> None:
+            entry.async_create_background_task(
+                hass,
+                coordinator.async_refresh(),
+                f"{coordinator.name} first refresh",
+            )
+
+        # Every node keeps its own offset afterwards, as the coordinator
+        # schedules the next refresh one interval after the previous one
+        delay = index * slot + random.uniform(0, slot)
+        entry.async_on_unload(
+            async_call_later(
+                hass, delay, HassJob(_async_refresh, cancel_on_shutdown=True)
+            )
+        )
+
+
 async def async_unload_entry(
     hass: HomeAssistant,
     entry: IntegrationBlueprintConfigEntry,
@@ -67,6 +219,19 @@ async def async_unload_entry(
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: IntegrationBlueprintConfigEntry,
+) -> None:
+    """Remove the stored payout history, snapshot and trends of the nodes."""
+    await asyncio.gather(
+        *(
+            async_remove_stores(hass, f"{node[CONF_HOST]}:{int(node[CONF_PORT])}")
+            for node in entry.data.get(CONF_NODES, [entry.data])
+        )
+    )
+
+
 async def async_reload_entry(
     hass: HomeAssistant,
     entry: IntegrationBlueprintConfigEntry,
@@ -0,0 +1,263 @@
+"""Capture of the raw node API traffic, and replay of it without a network."""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import gzip
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+from .api import IntegrationBlueprintApiClientCommunicationError, json_loads
+from .const import ENDPOINTS, LOGGER
+from .metrics import EndpointMetrics
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from .coordinator import BlueprintDataUpdateCoordinator
+    from .prometheus import MetricsFilter
+
+# A capture file is rotated once it would grow past this size, keeping this
+# many older files next to it as <name>.1, <name>.2...
+CAPTURE_MAX_BYTES = 10 * 1024 * 1024
+CAPTURE_BACKUPS = 3
+PAYSTUBS_PATH = "/api/heldamount/paystubs/"
+
+
+@dataclass(slots=True)
+class CaptureRecord:
+    """One request to a node and what it returned."""
+
+    # Wall-clock time the request started at
+    time: float
+    path: str
+    latency: float
+    body: bytes | None = None
+    error: str | None = None
+
+
+class CaptureWriter:
+    """
+    Append-only, gzip compressed file of the requests of one node.
+
+    It captures every request made to the node through its shared client, by
+    its coordinator, the fetch action and config flows alike. Every record
+    is written as its own gzip member, so the file stays readable when Home
+    Assistant stops in the middle of a write. Records are serialized,
+    compressed and written in order on a thread of their own, off the event
+    loop.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = CAPTURE_MAX_BYTES,
+        backups: int = CAPTURE_BACKUPS,
+    ) -> None:
+        """Initialize."""
+        self.path = path
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="storj_capture"
+        )
+
+    def record(
+        self,
+        url: str,
+        started: float,
+        latency: float,
+        body: bytes | None = None,
+        error: str | None = None,
+    ) -> None:
+        """Queue a request for writing."""
+        self._executor.submit(self._write, url, started, latency, body, error)
+
+    def _write(
+        self,
+        url: str,
+        started: float,
+        latency: float,
+        body: bytes | None,
+        error: str | None,
+    ) -> None:
+        """Append a request as a compressed record, rotating a full file."""
+        line = json.dumps(
+            {
+                "time": started,
+                "path": urlsplit(url).path,
+                "latency": latency,
+                "body": (
+                    body.decode("utf-8", "surrogateescape")
+                    if body is not None
+                    else None
+                ),
+                "error": error,
+            }
+        )
+        member = gzip.compress(f"{line}\n".encode())
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if (
+                self.path.exists()
+                and self.path.stat().st_size + len(member) > self._max_bytes
+            ):
+                self._rotate()
+            with self.path.open("ab") as file:
+                file.write(member)
+        except OSError as exception:
+            LOGGER.warning("Capturing to %s failed: %s", self.path, exception)
+
+    def _rotate(self) -> None:
+        """Shift the older files by one, dropping the oldest."""
+        for index in range(self._backups, 0, -1):
+            source = self.path.with_name(
+                f"{self.path.name}.{index - 1}" if index > 1 else self.path.name
+            )
+            if source.exists():
+                source.replace(self.path.with_name(f"{self.path.name}.{index}"))
+
+    def close(self) -> None:
+        """Stop capturing once the queued records are written."""
+        self._executor.shutdown(wait=False)
+
+
+def read_capture(path: Path) -> list[CaptureRecord]:
+    """Return the records of a capture and its rotated files, oldest first."""
+    backups: list[Path] = []
+    while (backup := path.with_name(f"{path.name}.{len(backups) + 1}")).exists():
+        backups.append(backup)
+    records: list[CaptureRecord] = []
+    for file in [*reversed(backups), path]:
+        if not file.exists():
+            continue
+        with gzip.open(file, "rt", encoding="utf-8") as lines:
+            try:
+                for line in lines:
+                    item = json.loads(line)
+                    records.append(
+                        CaptureRecord(
+                            time=item["time"],
+                            path=item["path"],
+                            latency=item["latency"],
+                            body=(
+                                item["body"].encode("utf-8", "surrogateescape")
+                                if item["body"] is not None
+                                else None
+                            ),
+                            error=item["error"],
+                        )
+                    )
+            except EOFError:
+                # The last record was cut short while it was written
+                LOGGER.warning("Capture %s ends in an incomplete record", file)
+    records.sort(key=lambda record: record.time)
+    return records
+
+
+class ReplayClient:
+    """
+    Stand-in for the API client answering from a capture.
+
+    Each path is answered with its last record up to the replay time, or its
+    first one while none was recorded yet. Paystubs are matched regardless
+    of their period range, which depends on the payout history cache.
+    """
+
+    def __init__(
+        self, target: str, records: list[CaptureRecord], speed: float | None = None
+    ) -> None:
+        """Initialize, simulating the captured latency at speed if given."""
+        self.target = target
+        self.metrics: dict[str, EndpointMetrics] = {}
+        self.now = records[0].time if records else 0.0
+        self._speed = speed
+        # Records and their times by path, in time order
+        self._records: dict[str, list[CaptureRecord]] = {}
+        for record in records:
+            self._records.setdefault(self._path_key(record.path), []).append(record)
+        self._times = {
+            key: [record.time for record in path_records]
+            for key, path_records in self._records.items()
+        }
+
+    @staticmethod
+    def _path_key(path: str) -> str:
+        """Return the key the records of a path are looked up by."""
+        return PAYSTUBS_PATH if path.startswith(PAYSTUBS_PATH) else path
+
+    def update_times(self) -> list[float]:
+        """Return the times of the captured refreshes, one per node status."""
+        return self._times.get(ENDPOINTS["sno"], [])
+
+    async def _async_answer(self, path: str, endpoint: str) -> CaptureRecord:
+        """Return the record answering a request, as the node did."""
+        metrics = self.metrics.setdefault(endpoint, EndpointMetrics())
+        records = self._records.get(self._path_key(path))
+        if not records:
+            metrics.record_error()
+            msg = f"No captured response of {path}"
+            raise IntegrationBlueprintApiClientCommunicationError(msg)
+        index = bisect.bisect_right(self._times[self._path_key(path)], self.now)
+        record = records[max(index - 1, 0)]
+        if self._speed:
+            await asyncio.sleep(record.latency / self._speed)
+        if record.error is not None:
+            metrics.record_error()
+            raise IntegrationBlueprintApiClientCommunicationError(record.error)
+        metrics.record_success(record.latency, len(record.body or b""), 0.0)
+        return record
+
+    async def async_get_data(
+        self,
+        path: str = "/api/sno/",
+        endpoint: str | None = None,
+        max_age: float = 0,
+    ) -> Any:
+        """Return the captured response of a path."""
+        record = await self._async_answer(path, endpoint or path)
+        return json_loads(record.body)
+
+    async def async_get_metrics(
+        self,
+        port: int,
+        metrics_filter: MetricsFilter,
+    ) -> dict[str, float]:
+        """Return the values of the selected series of the captured metrics."""
+        record = await self._async_answer("/metrics", "metrics")
+        parser = metrics_filter.parser()
+        for line in (record.body or b"").splitlines():
+            parser.feed(line)
+        return parser.values
+
+
+async def async_replay(
+    coordinator: BlueprintDataUpdateCoordinator,
+    client: ReplayClient,
+    speed: float | None = None,
+) -> int:
+    """
+    Refresh a coordinator once per captured refresh, returning the failures.
+
+    With a speed, the time between the captured refreshes is replayed that
+    many times faster, otherwise they follow each other right away.
+    """
+    failures = 0
+    times = client.update_times()
+    for index, update_time in enumerate(times):
+        if speed and index:
+            await asyncio.sleep((update_time - times[index - 1]) / speed)
+        # Every response recorded before the next refresh is part of this one
+        client.now = (
+            math.nextafter(times[index + 1], -math.inf)
+            if index + 1 < len(times)
+            else math.inf
+        )
+        await coordinator.async_refresh()
+        failures += not coordinator.last_update_success
+    return failures
@@ -0,0 +1,194 @@
+"""
+Standalone collector polling nodes next to them and pushing their data.
+
+The collector refreshes a coordinator per node, just as Home Assistant
+does, and posts the data of all its nodes as one compressed snapshot per
+interval to the webhook of the entry the nodes are pushed to. It needs the
+homeassistant package, but no running instance:
+
+    python -m custom_components.storj_node_statistics.collector \\
+        --webhook http://homeassistant.local:8123/api/webhook/<id> \\
+        --node 127.0.0.1:14002 --node 127.0.0.1:14003
+
+Without a webhook every snapshot is summarized in the log instead, to try
+it against the stand-in nodes of benchmarks/fake_node.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+
+from .api import IntegrationBlueprintApiClient
+from .const import (
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_PORT,
+    DEFAULT_REFRESH_INTERVALS,
+    DOMAIN,
+    LOGGER,
+)
+from .coordinator import BlueprintDataUpdateCoordinator
+from .push import build_snapshot, encode_snapshot
+
+PUSH_TIMEOUT = 30
+
+
+class Collector:
+    """Coordinators of the nodes next to the collector, pushed as one."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession,
+        targets: list[tuple[str, int]],
+        webhook: str | None,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+    ) -> None:
+        """Initialize."""
+        self._session = session
+        self._webhook = webhook
+        semaphore = asyncio.Semaphore(max_concurrent)
+        refresh_intervals = {
+            key: timedelta(minutes=minutes)
+            for key, minutes in DEFAULT_REFRESH_INTERVALS.items()
+        }
+        self.coordinators = [
+            BlueprintDataUpdateCoordinator(
+                hass=hass,
+                logger=LOGGER,
+                name=f"{DOMAIN} {host}:{port}",
+                client=IntegrationBlueprintApiClient(
+                    host=host, port=port, session=session
+                ),
+                refresh_intervals=refresh_intervals,
+                semaphore=semaphore,
+            )
+            for host, port in targets
+        ]
+
+    async def async_restore(self) -> None:
+        """Load the cached payout history and last data of every node."""
+        await asyncio.gather(
+            *(coordinator.async_restore() for coordinator in self.coordinators)
+        )
+
+    async def async_collect(self) -> dict[str, Any]:
+        """Refresh every node and return their snapshot."""
+        await asyncio.gather(
+            *(coordinator.async_refresh() for coordinator in self.coordinators)
+        )
+        return build_snapshot(self.coordinators)
+
+    async def async_push(self, snapshot: dict[str, Any]) -> None:
+        """Post a snapshot to the webhook, or summarize it without one."""
+        body = encode_snapshot(snapshot)
+        if self._webhook is None:
+            failed = {
+                target: node["error"]
+                for target, node in snapshot["nodes"].items()
+                if "error" in node
+            }
+            LOGGER.info(
+                "%d nodes | %d bytes compressed%s",
+                len(snapshot["nodes"]) - len(failed),
+                len(body),
+                "".join(f"\n  {target}: {error}" for target, error in failed.items()),
+            )
+            return
+        async with self._session.post(
+            self._webhook,
+            data=body,
+            headers={
+                "Content-Type": "application/json",
+                "Content-Encoding": "gzip",
+            },
+            timeout=aiohttp.ClientTimeout(total=PUSH_TIMEOUT),
+        ) as response:
+            response.raise_for_status()
+            accepted = (await response.json())["accepted"]
+        if ignored := snapshot["nodes"].keys() - set(accepted):
+            LOGGER.warning(
+                "Home Assistant ignored %s, push them in the options of the entry",
+                sorted(ignored),
+            )
+
+    async def async_run(self, interval: float, *, once: bool = False) -> None:
+        """Collect and push a snapshot every interval."""
+        while True:
+            started = time.monotonic()
+            snapshot = await self.async_collect()
+            try:
+                await self.async_push(snapshot)
+            except (aiohttp.ClientError, TimeoutError) as exception:
+                # The next snapshot carries the data again
+                LOGGER.warning("Pushing to %s failed: %s", self._webhook, exception)
+            if once:
+                return
+            await asyncio.sleep(max(interval - (time.monotonic() - started), 0))
+
+
+def _target(value: str) -> tuple[str, int]:
+    """Parse a host:port target, the port defaults to 14002."""
+    host, _, port = value.rpartition(":") if ":" in value else (value, "", "")
+    try:
+        return host, int(port) if port else DEFAULT_PORT
+    except ValueError as exception:
+        raise argparse.ArgumentTypeError(value) from exception
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--node", type=_target, action="append", required=True, help="host:port"
+    )
+    parser.add_argument("--webhook", help="URL of the webhook of the entry")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_REFRESH_INTERVALS["sno"] * 60,
+        help="seconds between snapshots",
+    )
+    parser.add_argument("--max-concurrent", type=int, default=DEFAULT_MAX_CONCURRENT)
+    parser.add_argument(
+        "--storage",
+        type=Path,
+        default=Path(".storj_collector"),
+        help="directory the payout history and last data of the nodes are kept in",
+    )
+    parser.add_argument("--once", action="store_true", help="push one snapshot")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    """Run the collector until interrupted."""
+    args = parse_args()
+    logging.basicConfig(
+        level=logging.WARNING, format="%(asctime)s %(levelname)s %(message)s"
+    )
+    # Snapshot summaries without a webhook are logged at info
+    LOGGER.setLevel(logging.INFO)
+    args.storage.mkdir(parents=True, exist_ok=True)
+    hass = HomeAssistant(str(args.storage))
+    try:
+        async with aiohttp.ClientSession() as session:
+            collector = Collector(
+                hass, session, args.node, args.webhook, args.max_concurrent
+            )
+            await collector.async_restore()
+            await collector.async_run(args.interval, once=args.once)
+    finally:
+        # Writes the stores of the nodes
+        await hass.async_stop(force=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
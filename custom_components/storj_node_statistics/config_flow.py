@@ -4,17 +4,77 @@ from __future__ import annotations
 
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.components import webhook
 from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from slugify import slugify
 
 from .api import (
-    IntegrationBlueprintApiClient,
     IntegrationBlueprintApiClientCommunicationError,
     IntegrationBlueprintApiClientError,
 )
-from .const import DOMAIN, LOGGER
+from .const import (
+    CONF_CAPTURE,
+    CONF_MAX_CONCURRENT,
+    CONF_METRICS,
+    CONF_METRICS_PORT,
+    CONF_NODES,
+    CONF_PUSH,
+    CONF_RULES,
+    CONF_WEBHOOK_ID,
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_METRICS,
+    DEFAULT_PORT,
+    DEFAULT_REFRESH_INTERVALS,
+    DEFAULT_RULES,
+    DOMAIN,
+    LOGGER,
+)
+from .data import async_get_client, async_release_client
+from .discovery import async_scan, parse_port_range, scan_targets
+from .rules import parse_rule
+
+CONF_TARGETS = "targets"
+CONF_SUBNET = "subnet"
+CONF_PORTS = "ports"
+CONF_FOUND = "found"
+DEFAULT_PORTS = f"{DEFAULT_PORT}-{DEFAULT_PORT + 18}"
+
+
+def _lines(text: str) -> list[str]:
+    """Return the non-empty lines of a multiline option."""
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def _parse_targets(targets: str) -> list[dict[str, str | int]]:
+    """Parse host:port targets separated by whitespace or commas."""
+    nodes: dict[str, dict[str, str | int]] = {}
+    for target in targets.replace(",", " ").split():
+        host, _, port = target.rpartition(":") if ":" in target else (target, "", "")
+        port_number = int(port) if port else DEFAULT_PORT
+        if not host or not 0 < port_number < 65536:
+            raise ValueError(target)
+        nodes[f"{host}:{port_number}"] = {CONF_HOST: host, CONF_PORT: port_number}
+    return list(nodes.values())
+
+
+@callback
+def _async_configured_nodes(hass: HomeAssistant) -> set[str]:
+    """Return the host:port and known node IDs of every configured node."""
+    configured: set[str] = set()
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        for node in entry.data.get(CONF_NODES, [entry.data]):
+            if CONF_HOST in node:
+                configured.add(f"{node[CONF_HOST]}:{int(node[CONF_PORT])}")
+        if entry.state is config_entries.ConfigEntryState.LOADED:
+            configured.update(
+                coordinator.data["sno"].node_id
+                for coordinator in entry.runtime_data.coordinators
+                if coordinator.data is not None and "sno" in coordinator.data
+            )
+    return configured
 
 
 class BlueprintFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -22,16 +82,40 @@ class BlueprintFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize."""
+        # Nodes found by the last scan, node ID by host:port
+        self._found: dict[str, str] = {}
+        self._max_concurrent = DEFAULT_MAX_CONCURRENT
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> BlueprintOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return BlueprintOptionsFlowHandler()
+
     async def async_step_user(
         self,
         user_input: dict | None = None,
     ) -> config_entries.ConfigFlowResult:
         """Handle a flow initialized by the user."""
+        return self.async_show_menu(
+            step_id="user", menu_options=["node", "fleet", "discover"]
+        )
+
+    async def async_step_node(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Handle adding a single node."""
         _errors: dict[str, str] = {}
 
         if user_input is not None:
+            unique_id = f"{user_input[CONF_HOST]}:{int(user_input[CONF_PORT])}"
             try:
-                await self._test_connection(
+                node_id = await self._test_connection(
                     host=user_input[CONF_HOST],
                     port=user_input[CONF_PORT],
                 )
@@ -42,16 +126,20 @@ class BlueprintFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 LOGGER.exception("Unexpected error: %s", exception)
                 _errors["base"] = "unknown"
             else:
-                unique_id = f"{user_input[CONF_HOST]}:{int(user_input[CONF_PORT])}"
-                await self.async_set_unique_id(slugify(unique_id))
-                self._abort_if_unique_id_configured()
-                return self.async_create_entry(
-                    title=unique_id,
-                    data=user_input,
-                )
+                # The node of another entry, alone or in a fleet, would share
+                # its stored data with this one
+                if {unique_id, node_id} & _async_configured_nodes(self.hass):
+                    _errors["base"] = "already_configured"
+                else:
+                    await self.async_set_unique_id(slugify(unique_id))
+                    self._abort_if_unique_id_configured()
+                    return self.async_create_entry(
+                        title=unique_id,
+                        data=user_input,
+                    )
 
         return self.async_show_form(
-            step_id="user",
+            step_id="node",
             data_schema=vol.Schema(
                 {
                     vol.Required(
@@ -64,7 +152,7 @@ class BlueprintFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                     ),
                     vol.Required(
                         CONF_PORT,
-                        default=(user_input or {}).get(CONF_PORT, 14002),
+                        default=(user_input or {}).get(CONF_PORT, DEFAULT_PORT),
                     ): selector.NumberSelector(
                         selector.NumberSelectorConfig(
                             min=1,
@@ -77,11 +165,311 @@ class BlueprintFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             errors=_errors,
         )
 
-    async def _test_connection(self, host: str, port: int) -> None:
-        """Validate that the device is reachable."""
-        client = IntegrationBlueprintApiClient(
-            host=host,
-            port=port,
-            session=async_create_clientsession(self.hass),
+    async def async_step_fleet(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Handle adding a fleet of nodes polled by one entry."""
+        _errors: dict[str, str] = {}
+
+        if user_input is not None:
+            try:
+                nodes = _parse_targets(user_input[CONF_TARGETS])
+            except ValueError as exception:
+                LOGGER.error("Invalid target: %s", exception)
+                nodes = []
+            configured = _async_configured_nodes(self.hass)
+            duplicates = [
+                f"{node[CONF_HOST]}:{node[CONF_PORT]}"
+                for node in nodes
+                if f"{node[CONF_HOST]}:{node[CONF_PORT]}" in configured
+            ]
+            if not nodes:
+                _errors["base"] = "targets"
+            elif duplicates:
+                LOGGER.error("Nodes already configured: %s", ", ".join(duplicates))
+                _errors["base"] = "already_configured"
+            else:
+                return await self._async_create_fleet(
+                    nodes, int(user_input[CONF_MAX_CONCURRENT])
+                )
+
+        return self.async_show_form(
+            step_id="fleet",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_TARGETS,
+                        default=(user_input or {}).get(CONF_TARGETS, vol.UNDEFINED),
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.TEXT,
+                            multiline=True,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_MAX_CONCURRENT,
+                        default=(user_input or {}).get(
+                            CONF_MAX_CONCURRENT, DEFAULT_MAX_CONCURRENT
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=64,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                },
+            ),
+            errors=_errors,
+        )
+
+    async def async_step_discover(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Handle scanning a subnet and port range for nodes."""
+        _errors: dict[str, str] = {}
+
+        if user_input is not None:
+            try:
+                targets = scan_targets(
+                    user_input[CONF_SUBNET], parse_port_range(user_input[CONF_PORTS])
+                )
+            except ValueError as exception:
+                LOGGER.error("Invalid scan: %s", exception)
+                _errors["base"] = "scan"
+            else:
+                found = await async_scan(async_get_clientsession(self.hass), targets)
+                configured = _async_configured_nodes(self.hass)
+                self._found = {
+                    target: node_id
+                    for target, node_id in sorted(found.items())
+                    if target not in configured and node_id not in configured
+                }
+                self._max_concurrent = int(user_input[CONF_MAX_CONCURRENT])
+                if self._found:
+                    return await self.async_step_discover_select()
+                _errors["base"] = "no_nodes"
+
+        return self.async_show_form(
+            step_id="discover",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_SUBNET,
+                        default=(user_input or {}).get(CONF_SUBNET, vol.UNDEFINED),
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.TEXT,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_PORTS,
+                        default=(user_input or {}).get(CONF_PORTS, DEFAULT_PORTS),
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.TEXT,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_MAX_CONCURRENT,
+                        default=(user_input or {}).get(
+                            CONF_MAX_CONCURRENT, DEFAULT_MAX_CONCURRENT
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=64,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                },
+            ),
+            errors=_errors,
+        )
+
+    async def async_step_discover_select(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Handle choosing the found nodes to add as a fleet."""
+        _errors: dict[str, str] = {}
+
+        if user_input is not None:
+            try:
+                nodes = _parse_targets(" ".join(user_input[CONF_FOUND]))
+            except ValueError as exception:
+                LOGGER.error("Invalid target: %s", exception)
+                nodes = []
+            if nodes:
+                return await self._async_create_fleet(nodes, self._max_concurrent)
+            _errors["base"] = "targets"
+
+        return self.async_show_form(
+            step_id="discover_select",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_FOUND, default=list(self._found)
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[
+                                selector.SelectOptionDict(
+                                    value=target, label=f"{node_id} ({target})"
+                                )
+                                for target, node_id in self._found.items()
+                            ],
+                            multiple=True,
+                            mode=selector.SelectSelectorMode.LIST,
+                        ),
+                    ),
+                },
+            ),
+            description_placeholders={"count": str(len(self._found))},
+            errors=_errors,
+        )
+
+    async def _async_create_fleet(
+        self, nodes: list[dict[str, str | int]], max_concurrent: int
+    ) -> config_entries.ConfigFlowResult:
+        """Create a fleet entry polling nodes."""
+        targets = sorted(f"{node[CONF_HOST]}:{node[CONF_PORT]}" for node in nodes)
+        await self.async_set_unique_id(slugify(f"fleet {' '.join(targets)}"))
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=f"Fleet of {len(nodes)} nodes",
+            data={
+                CONF_NODES: nodes,
+                CONF_MAX_CONCURRENT: max_concurrent,
+            },
+        )
+
+    async def _test_connection(self, host: str, port: int) -> str | None:
+        """Validate that the device is reachable and return its node ID."""
+        # The shared client answers from a running or recent request of the
+        # node instead of requesting it again. It is released right after, so
+        # flows that fail or are aborted leave no client behind
+        client = async_get_client(self.hass, host, port)
+        try:
+            status = await client.async_get_data()
+        finally:
+            async_release_client(self.hass, client.target)
+        return status.get("nodeID") if isinstance(status, dict) else None
+
+
+class BlueprintOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for Blueprint."""
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the refresh intervals, the debug metrics to read and rules."""
+        _errors: dict[str, str] = {}
+        options = self.config_entry.options
+        targets = [
+            f"{node[CONF_HOST]}:{node[CONF_PORT]}"
+            for node in self.config_entry.data.get(CONF_NODES, [self.config_entry.data])
+        ]
+        if user_input is not None:
+            rules = _lines(user_input[CONF_RULES])
+            try:
+                for rule in rules:
+                    parse_rule(rule)
+            except ValueError as exception:
+                LOGGER.error("Invalid rule: %s", exception)
+                _errors[CONF_RULES] = "rules"
+            else:
+                return self.async_create_entry(
+                    data={
+                        **{
+                            key: int(user_input[key])
+                            for key in DEFAULT_REFRESH_INTERVALS
+                        },
+                        CONF_METRICS_PORT: int(user_input[CONF_METRICS_PORT]),
+                        CONF_METRICS: _lines(user_input[CONF_METRICS]),
+                        CONF_RULES: rules,
+                        CONF_CAPTURE: user_input[CONF_CAPTURE],
+                        CONF_PUSH: user_input[CONF_PUSH],
+                    },
+                )
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    **{
+                        vol.Required(
+                            key,
+                            default=options.get(key, default),
+                        ): selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=1,
+                                max=1440,
+                                unit_of_measurement="min",
+                                mode=selector.NumberSelectorMode.BOX,
+                            ),
+                        )
+                        for key, default in DEFAULT_REFRESH_INTERVALS.items()
+                    },
+                    vol.Required(
+                        CONF_METRICS_PORT,
+                        default=options.get(CONF_METRICS_PORT, 0),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=65535,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_METRICS,
+                        default="\n".join(options.get(CONF_METRICS, DEFAULT_METRICS)),
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.TEXT,
+                            multiline=True,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_RULES,
+                        default=(user_input or {}).get(
+                            CONF_RULES,
+                            "\n".join(options.get(CONF_RULES, DEFAULT_RULES)),
+                        ),
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.TEXT,
+                            multiline=True,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_CAPTURE,
+                        default=options.get(CONF_CAPTURE, False),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_PUSH,
+                        default=[
+                            target
+                            for target in options.get(CONF_PUSH, [])
+                            if target in targets
+                        ],
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=targets,
+                            multiple=True,
+                            mode=selector.SelectSelectorMode.LIST,
+                        ),
+                    ),
+                },
+            ),
+            description_placeholders={
+                "webhook_path": (
+                    webhook.async_generate_path(self.config_entry.data[CONF_WEBHOOK_ID])
+                    if CONF_WEBHOOK_ID in self.config_entry.data
+                    else "-"
+                )
+            },
+            errors=_errors,
         )
-        await client.async_get_data()
@@ -6,3 +6,63 @@ LOGGER: Logger = getLogger(__package__)
 
 DOMAIN = "storj_node_statistics"
 ATTRIBUTION = "Data provided by http://jsonplaceholder.typicode.com/"
+
+# Node API endpoints, keyed by the name they are stored under in coordinator data
+ENDPOINTS: dict[str, str] = {
+    "sno": "/api/sno/",
+    "satellites": "/api/sno/satellites",
+    "satellite": "/api/sno/satellite/{satellite_id}",
+    "estimated-payout": "/api/sno/estimated-payout",
+    "held_history": "/api/heldamount/held-history",
+    "paystubs": "/api/heldamount/paystubs/2000-1/2100-1",
+}
+
+# Default refresh interval per endpoint in minutes, overridable in the options flow
+DEFAULT_REFRESH_INTERVALS: dict[str, int] = {
+    "sno": 10,
+    "satellites": 10,
+    "satellite": 10,
+    "estimated-payout": 10,
+    "held_history": 720,
+    "paystubs": 720,
+}
+
+# Fleet entries poll a list of nodes with a shared limit on concurrent refreshes
+CONF_NODES = "nodes"
+CONF_MAX_CONCURRENT = "max_concurrent"
+DEFAULT_PORT = 14002
+DEFAULT_MAX_CONCURRENT = 4
+
+# Optional series of the node debug endpoint, in Prometheus text format, that
+# become sensors. The endpoint is only polled when its port is set
+CONF_METRICS_PORT = "metrics_port"
+CONF_METRICS = "metrics"
+DEFAULT_METRICS: tuple[str, ...] = (
+    "upload_success_count",
+    "upload_failure_count",
+    "upload_cancel_count",
+    "download_success_count",
+    "download_failure_count",
+    "download_cancel_count",
+)
+
+# Raw node API traffic is written to <config>/storj_node_statistics/captures
+# while enabled, to reproduce odd data later
+CONF_CAPTURE = "capture"
+
+# Nodes, as host:port, whose data a collector process next to them pushes to
+# the webhook of the entry instead of being polled
+CONF_PUSH = "push"
+CONF_WEBHOOK_ID = "webhook_id"
+# A pushed node is unavailable after this many refresh intervals without a push
+PUSH_TIMEOUT_TICKS = 3
+
+# Rules checked on every update of a node, firing an event when a value crosses
+# a threshold or, for "changed" rules, whenever it changes
+CONF_RULES = "rules"
+DEFAULT_RULES: tuple[str, ...] = (
+    "storj_disk_use_percentage > 95",
+    "storj_satellite_online < 98",
+    "storj_version changed",
+    "storj_quic changed",
+)
@@ -2,18 +2,63 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
+from collections import Counter
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+from slugify import slugify
 
 from .api import (
+    CircuitBreaker,
     IntegrationBlueprintApiClientAuthenticationError,
     IntegrationBlueprintApiClientError,
 )
+from .const import DOMAIN, ENDPOINTS, LOGGER, PUSH_TIMEOUT_TICKS
+from .daily_statistics import DailyStatisticsImporter
+from .derive import derive_values
+from .forecast import NodeForecast
+from .history import PayoutHistoryCache
+from .models import PARSERS, dump_records, load_records
+from .prometheus import MetricsFilter
+from .rates import CounterRing, rate_values
+from .rules import RuleEngine
 
 if TYPE_CHECKING:
+    from datetime import timedelta
+    from logging import Logger
+
+    from homeassistant.core import HomeAssistant
+    from homeassistant.util.event_type import EventType
+
+    from .api import IntegrationBlueprintApiClient
     from .data import IntegrationBlueprintConfigEntry
+    from .push import PushedNode
+    from .rules import Rule
+
+SNAPSHOT_VERSION = 1
+# Refreshes are frequent, so the snapshot is written at most every few minutes
+# and on shutdown
+SNAPSHOT_SAVE_DELAY = 300
+# Stores kept per node, as <domain>.<node>.<name>
+NODE_STORES = ("snapshot", "history", "statistics", "forecast")
+
+
+async def async_remove_stores(hass: HomeAssistant, target: str) -> None:
+    """Remove the stores of a node, once no coordinator writes them anymore."""
+    await asyncio.gather(
+        *(
+            Store(
+                hass, SNAPSHOT_VERSION, f"{DOMAIN}.{slugify(target)}.{name}"
+            ).async_remove()
+            for name in NODE_STORES
+        )
+    )
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
@@ -22,32 +67,435 @@ class BlueprintDataUpdateCoordinator(DataUpdateCoordinator):
 
     config_entry: IntegrationBlueprintConfigEntry
 
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        logger: Logger,
+        name: str,
+        client: IntegrationBlueprintApiClient,
+        refresh_intervals: dict[str, timedelta],
+        semaphore: asyncio.Semaphore,
+        metrics_port: int | None = None,
+        metric_selectors: list[str] | None = None,
+        rules: list[Rule] | None = None,
+        push: bool = False,
+    ) -> None:
+        """Initialize, ticking at the interval of the most frequent endpoint."""
+        tick = min(refresh_intervals.values())
+        # A pushed node is refreshed only when its pushes stopped, as each
+        # push restarts the interval
+        super().__init__(
+            hass=hass,
+            logger=logger,
+            name=name,
+            update_interval=tick * PUSH_TIMEOUT_TICKS if push else tick,
+        )
+        self.client = client
+        self.push = push
+        self._last_pushed = 0.0
+        # Shared by the nodes of a fleet entry to bound concurrent refreshes
+        self._semaphore = semaphore
+        self._refresh_intervals = {
+            key: interval.total_seconds() for key, interval in refresh_intervals.items()
+        }
+        # Allow half a tick of slack so timer drift does not push an endpoint
+        # to the tick after the one it was due on
+        self._slack = tick.total_seconds() / 2
+        self._last_fetched: dict[str, float] = {}
+        # Fixed, so an endpoint fetched once has one wall clock fetch time
+        self._wall_offset = time.time() - time.monotonic()
+        # Number of enabled entities using each endpoint, None until the first
+        # entity is added. Everything is fetched until the node has data, as
+        # its entities are created from it
+        self._endpoint_users: Counter[str] | None = None
+        # An unreachable node is retried after one tick, then two, four...
+        self.breaker = CircuitBreaker(base_delay=tick.total_seconds())
+        # The debug metrics are fetched along with the node status
+        self._metrics_port = metrics_port
+        self.metrics_filter = (
+            MetricsFilter(metric_selectors)
+            if metrics_port and metric_selectors
+            else None
+        )
+        self.history = PayoutHistoryCache(hass, slugify(client.target))
+        self.statistics = DailyStatisticsImporter(hass, slugify(client.target))
+        self.forecast = NodeForecast(hass, slugify(client.target))
+        self._snapshot: Store[dict[str, Any]] = Store(
+            hass, SNAPSHOT_VERSION, f"{DOMAIN}.{slugify(client.target)}.snapshot"
+        )
+        # Recent counter samples, for throughput without recorder queries. The
+        # satellites totals only move when the summary is fetched, so they are
+        # sampled at its fetch time instead of every tick
+        self.counters = CounterRing(tick.total_seconds())
+        self.satellite_counters = CounterRing(
+            refresh_intervals["satellites"].total_seconds()
+        )
+        self._satellites_sampled: float | None = None
+        self.rules = RuleEngine(client.target, rules or [])
+        self.values: dict[str, Any] = {}
+        self.changed_keys: set[str] = set()
+        self.skipped_writes = 0
+        self._restored = False
+        # Whether the data is the restored snapshot, not yet confirmed by a
+        # refresh or push since
+        self.stale = False
+
+    async def async_restore(self) -> None:
+        """Load the cached payout history and the last good data of the node."""
+        await self.history.async_load()
+        await self.statistics.async_load()
+        await self.forecast.async_load()
+        self._restored = True
+        if self.history.held_history_fetched is not None:
+            # Skip fetches the cached held history makes unneeded
+            age = dt_util.utcnow() - self.history.held_history_fetched
+            self._last_fetched["held_history"] = time.monotonic() - max(
+                age.total_seconds(), 0
+            )
+        if (stored := await self._snapshot.async_load()) is None:
+            return
+        # Entities are created from the restored data right away, every
+        # endpoint but the cached held history is fetched on the next refresh
+        self.data = load_records(stored["data"])
+        self.stale = True
+        self._derive_values(self.data)
+        # The restored values are what the rules compare the next ones with
+        self._check_rules(self.data)
+
+    async def async_shutdown(self) -> None:
+        """
+        Stop refreshing and write the stores the delayed saves would write.
+
+        Nothing is left to write them after the entry unloaded, when it is
+        reloaded or removed. Stores are not written before they were loaded,
+        so a failed setup does not overwrite them.
+        """
+        await super().async_shutdown()
+        if not self._restored:
+            return
+        await asyncio.gather(
+            self.history.async_save(),
+            self.statistics.async_save(),
+            self.forecast.async_save(),
+        )
+        if self.data is not None:
+            await self._snapshot.async_save(self._snapshot_to_save())
+
+    def _snapshot_to_save(self) -> dict[str, Any]:
+        """Return the last good data to store."""
+        return {"saved": dt_util.utcnow().isoformat(), "data": dump_records(self.data)}
+
+    def _derive_values(self, data: dict[str, Any]) -> None:
+        """Derive the sensor values and the keys that changed since the last."""
+        previous = self.values
+        total_paid = (
+            self.history.total_paid(data["paystubs"]) if "paystubs" in data else None
+        )
+        self.values = derive_values(data, total_paid)
+        self.values.update(rate_values(self.counters, self.satellite_counters))
+        now = dt_util.utcnow()
+        if (satellites := data.get("satellites")) is not None:
+            self.forecast.async_add_days(satellites, now)
+        self.values.update(self.forecast.values(data, now))
+        self.changed_keys = {
+            key
+            for key, value in self.values.items()
+            if key not in previous or previous[key] != value
+        }
+
+    def _check_rules(
+        self, data: dict[str, Any]
+    ) -> list[tuple[EventType[Any], dict[str, Any]]]:
+        """Return the events of the rules on the values that changed."""
+        return self.rules.check(self.values, self.changed_keys, data["sno"].satellites)
+
+    @callback
+    def async_add_endpoint_user(self, endpoints: tuple[str, ...]) -> CALLBACK_TYPE:
+        """Fetch endpoints for an entity until the returned callback is called."""
+        if self._endpoint_users is None:
+            self._endpoint_users = Counter()
+        users = self._endpoint_users
+        users.update(endpoints)
+
+        @callback
+        def _async_remove_endpoint_user() -> None:
+            users.subtract(endpoints)
+
+        return _async_remove_endpoint_user
+
+    def _needed_endpoints(self) -> list[str]:
+        """Return the endpoints used by enabled entities, the node status always."""
+        if self._endpoint_users is None or self.data is None:
+            return list(ENDPOINTS)
+        return [
+            key for key in ENDPOINTS if key == "sno" or self._endpoint_users[key] > 0
+        ]
+
+    def _endpoint_path(
+        self, key: str, satellite_id: str | None = None, *, complete: bool = False
+    ) -> str:
+        """Return the path to fetch an endpoint from."""
+        if key == "paystubs":
+            return self.history.paystubs_path(complete=complete)
+        if key == "satellite":
+            return ENDPOINTS[key].format(satellite_id=satellite_id)
+        return ENDPOINTS[key]
+
+    def _due_endpoints(self) -> list[str]:
+        """Return the endpoints whose refresh interval has elapsed."""
+        now = time.monotonic()
+        return [
+            key
+            for key in self._needed_endpoints()
+            if key not in self._last_fetched
+            or now - self._last_fetched[key]
+            >= self._refresh_intervals[key] - self._slack
+        ]
+
     async def _async_update_data(self) -> Any:
         """Update data via library."""
-        try:
-            client = self.config_entry.runtime_data.client
-
-            sno_data = await client.async_get_data("/api/sno/")
-            satellites_data = await client.async_get_data("/api/sno/satellites")
-            estimated_payout_data = await client.async_get_data(
-                "/api/sno/estimated-payout"
+        self.changed_keys = set()
+        if self.push:
+            msg = (
+                f"No snapshot of {self.client.target} was pushed"
+                f" in {self.update_interval.total_seconds():.0f} s"
             )
-            held_history_data = await client.async_get_data(
-                "/api/heldamount/held-history"
+            raise UpdateFailed(msg)
+        await self._async_check_breaker()
+
+        # Start from the previous data so endpoints that are not due or fail
+        # keep their last good data and the other sensors still update
+        data: dict[str, Any] = dict(self.data or {})
+        if "held_history" not in data and self.history.held_history is not None:
+            data["held_history"] = self.history.held_history
+        errors: dict[str, IntegrationBlueprintApiClientError] = {}
+
+        # The satellites of a node are known from its previous status, so all
+        # due endpoints and every satellite are fetched at once
+        keys = self._due_endpoints()
+        requests = [(key, None) for key in keys if key != "satellite"]
+        if (
+            "sno" in keys
+            and self.metrics_filter is not None
+            and (
+                self._endpoint_users is None
+                or self.data is None
+                or self._endpoint_users["metrics"] > 0
             )
-            paystubs_data = await client.async_get_data(
-                "/api/heldamount/paystubs/2000-1/2100-1"
+        ):
+            requests.append(("metrics", None))
+        data["satellite"] = dict(data.get("satellite", {}))
+        if "satellite" in keys and "sno" in data:
+            requests.extend(
+                ("satellite", satellite_id) for satellite_id in data["sno"].satellites
             )
+        async with self._semaphore:
+            await self._async_fetch(data, requests, errors)
+            if "sno" in data and "satellite" in self._needed_endpoints():
+                # Satellites new to the node status, or all of them on the first
+                # refresh, are fetched right away instead of on the next interval
+                requested = {satellite_id for _, satellite_id in requests}
+                new_requests = [
+                    ("satellite", satellite_id)
+                    for satellite_id in data["sno"].satellites
+                    if satellite_id not in data["satellite"]
+                    and satellite_id not in requested
+                ]
+                await self._async_fetch(data, new_requests, errors)
+                requests.extend(new_requests)
+                data["satellite"] = {
+                    satellite_id: data["satellite"][satellite_id]
+                    for satellite_id in data["sno"].satellites
+                    if satellite_id in data["satellite"]
+                }
+
+        if errors:
+            missing = [key for key in self._needed_endpoints() if key not in data]
+            if len(errors) == len(requests):
+                self.breaker.record_failure()
+            if len(errors) == len(requests) or missing:
+                # Nothing usable to show, or an endpoint has never succeeded
+                raise UpdateFailed(next(iter(errors.values())))
+            for key, exception in errors.items():
+                LOGGER.warning(
+                    "Keeping previous %s data, fetching it failed: %s", key, exception
+                )
+
+        self.breaker.record_success()
+        fetched = self._last_fetched.get("satellites")
+        self._process_data(data, fetched if self._is_new_satellites(fetched) else None)
+        return data
+
+    def fetched_at(self, key: str) -> float | None:
+        """Return the wall clock time an endpoint was last fetched."""
+        if (fetched := self._last_fetched.get(key)) is None:
+            return None
+        return fetched + self._wall_offset
+
+    def _is_new_satellites(self, fetched: float | None) -> bool:
+        """Return whether the satellites summary fetched at a time is unsampled."""
+        if fetched is None or fetched == self._satellites_sampled:
+            return False
+        self._satellites_sampled = fetched
+        return True
+
+    @callback
+    def async_set_pushed_data(self, pushed: PushedNode, sent: float) -> bool:
+        """
+        Take the data of the node pushed by a collector, or its error.
+
+        Snapshots sent before the last one taken, such as retried pushes,
+        are ignored. Returns whether the snapshot was taken.
+        """
+        if sent <= self._last_pushed:
+            return False
+        if pushed.data is None:
+            self._last_pushed = sent
+            self.async_set_update_error(UpdateFailed(pushed.error))
+            return True
+        data = pushed.data
+        self.history.set_finished_paid(pushed.finished_paid)
+        self.changed_keys = set()
+        fetched = pushed.satellites_fetched
+        self._process_data(
+            data,
+            # On the clock of the collector, only differences of it are used
+            time.monotonic() - (time.time() - fetched)
+            if self._is_new_satellites(fetched)
+            else None,
+        )
+        # Only once taken, so a retry of a snapshot that failed is not ignored
+        self._last_pushed = sent
+        self.async_set_updated_data(data)
+        return True
 
-            return {
-                "sno": sno_data,
-                "satellites": satellites_data,
-                "estimated-payout": estimated_payout_data,
-                "held_history": held_history_data,
-                "paystubs": paystubs_data,
-            }
+    def _process_data(
+        self, data: dict[str, Any], satellites_fetched: float | None
+    ) -> None:
+        """
+        Derive the values of new data and act on what changed.
 
-        except IntegrationBlueprintApiClientAuthenticationError as exception:
-            raise ConfigEntryAuthFailed(exception) from exception
+        The satellites totals are sampled when their summary is new, at the
+        monotonic time it was fetched.
+        """
+        self.stale = False
+        satellites = data.get("satellites")
+        if satellites is not None and satellites_fetched is not None:
+            self.satellite_counters.add(
+                satellites_fetched,
+                (satellites.ingress_summary, satellites.egress_summary),
+            )
+        self.counters.add(
+            time.monotonic(), (data["sno"].bandwidth_used, data["sno"].disk_used)
+        )
+        # Derive every sensor value once here instead of in each entity, and
+        # diff against the previous values so unchanged sensors skip writing
+        self._derive_values(data)
+        for event_type, event_data in self._check_rules(data):
+            self.hass.bus.async_fire(event_type, event_data)
+        if (node_id := data["sno"].node_id) and satellites:
+            self.statistics.async_import(node_id[:6].lower(), satellites)
+        self._snapshot.async_delay_save(self._snapshot_to_save, SNAPSHOT_SAVE_DELAY)
+
+    async def _async_check_breaker(self) -> None:
+        """Fail fast while a dead node is backed off from, then probe it once."""
+        if not self.breaker.is_open:
+            return
+        if retry_in := self.breaker.retry_in():
+            self.breaker.skip()
+            msg = f"{self.client.target} is unreachable, retrying in {retry_in:.0f} s"
+            raise UpdateFailed(msg)
+        # A single cheap request tells if the node is back before every
+        # endpoint is fetched again
+        try:
+            async with self._semaphore:
+                await self.client.async_get_data(ENDPOINTS["sno"], endpoint="sno")
         except IntegrationBlueprintApiClientError as exception:
+            self.breaker.record_failure()
             raise UpdateFailed(exception) from exception
+
+    async def async_fetch_json(self, keys: list[str], max_age: float) -> dict[str, Any]:
+        """
+        Return the JSON of endpoints as the node returned it.
+
+        Responses at most max_age seconds old come from the client cache, the
+        others are requested concurrently. Satellites are those of the last
+        node status, which is requested first if there is none yet. Paystubs
+        cover every period, not only those the refresh leaves uncached.
+        """
+        satellite_ids: list[str] = []
+        if "satellite" in keys:
+            if self.data is not None and "sno" in self.data:
+                satellite_ids = list(self.data["sno"].satellites)
+            else:
+                status = await self.client.async_get_data(
+                    ENDPOINTS["sno"], endpoint="sno", max_age=max_age
+                )
+                satellite_ids = list(PARSERS["sno"](status).satellites)
+        requests = [(key, None) for key in keys if key != "satellite"]
+        requests.extend(("satellite", satellite_id) for satellite_id in satellite_ids)
+        async with self._semaphore:
+            results = await asyncio.gather(
+                *(
+                    self.client.async_get_data(
+                        self._endpoint_path(key, satellite_id, complete=True),
+                        endpoint=key,
+                        max_age=max_age,
+                    )
+                    for key, satellite_id in requests
+                )
+            )
+        data: dict[str, Any] = {"satellite": {}} if "satellite" in keys else {}
+        for (key, satellite_id), result in zip(requests, results, strict=True):
+            if satellite_id is not None:
+                data[key][satellite_id] = result
+            else:
+                data[key] = result
+        return data
+
+    async def _async_request(self, key: str, satellite_id: str | None) -> Any:
+        """Request one endpoint."""
+        if key == "metrics" and self.metrics_filter is not None:
+            return await self.client.async_get_metrics(
+                self._metrics_port, self.metrics_filter
+            )
+        return await self.client.async_get_data(
+            self._endpoint_path(key, satellite_id), endpoint=key
+        )
+
+    async def _async_fetch(
+        self,
+        data: dict[str, Any],
+        requests: list[tuple[str, str | None]],
+        errors: dict[str, IntegrationBlueprintApiClientError],
+    ) -> None:
+        """Fetch endpoints concurrently and store their parsed records in data."""
+        results = await asyncio.gather(
+            *(self._async_request(key, satellite_id) for key, satellite_id in requests),
+            return_exceptions=True,
+        )
+        fetched_at = time.monotonic()
+        for (key, satellite_id), result in zip(requests, results, strict=True):
+            if isinstance(result, IntegrationBlueprintApiClientAuthenticationError):
+                raise ConfigEntryAuthFailed(result) from result
+            if isinstance(result, IntegrationBlueprintApiClientError):
+                errors[f"{key} {satellite_id}" if satellite_id else key] = result
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            if key == "metrics":
+                # The debug metrics are filtered to their values while read
+                data[key] = result
+                continue
+            # Keep only the parsed fields, not the decoded JSON tree
+            record = PARSERS[key](result)
+            if key == "paystubs":
+                # Only the open periods are kept, finished ones live in the cache
+                record = self.history.add_paystubs(record)
+            elif key == "held_history":
+                self.history.set_held_history(record)
+            if satellite_id is not None:
+                data[key][satellite_id] = record
+            else:
+                data[key] = record
+            self._last_fetched[key] = fetched_at
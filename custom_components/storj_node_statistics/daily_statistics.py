@@ -0,0 +1,126 @@
+"""Import the daily series of a node into long-term statistics."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import UnitOfInformation
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .derive import BYTES_PER_GB
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .models import DailySeries, SatellitesSummary
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+# Statistic name, daily series of the satellites summary, whether the days
+# add up to a total or are an average
+DAILY_STATISTICS: tuple[tuple[str, str, bool], ...] = (
+    ("egress", "egress_daily", True),
+    ("ingress", "ingress_daily", True),
+    ("storage", "storage_daily", False),
+)
+
+
+class DailyStatisticsImporter:
+    """Write the new and changed days of a node as external statistics."""
+
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{key}.statistics"
+        )
+        # Per statistic the sum of the days before the current month and the
+        # values of the days that were imported last
+        self._imported: dict[str, dict[str, Any]] = {}
+        self._last_summary: SatellitesSummary | None = None
+
+    async def async_load(self) -> None:
+        """Load what was imported before from disk."""
+        if (stored := await self._store.async_load()) is not None:
+            self._imported = stored
+
+    async def async_save(self) -> None:
+        """Write what was imported now instead of after the save delay."""
+        await self._store.async_save(self._imported)
+
+    @callback
+    def async_import(self, prefix: str, summary: SatellitesSummary) -> None:
+        """Import the days of a newly fetched summary that are new or changed."""
+        if (
+            summary is self._last_summary
+            or "recorder" not in self._hass.config.components
+        ):
+            return
+        self._last_summary = summary
+        imported = False
+        for name, attribute, has_sum in DAILY_STATISTICS:
+            statistic_id = f"{DOMAIN}:{prefix}_{name}_daily"
+            rows = self._changed_rows(
+                statistic_id, getattr(summary, attribute), has_sum=has_sum
+            )
+            if not rows:
+                continue
+            async_add_external_statistics(
+                self._hass,
+                StatisticMetaData(
+                    has_mean=not has_sum,
+                    has_sum=has_sum,
+                    name=f"{prefix} {name} daily",
+                    source=DOMAIN,
+                    statistic_id=statistic_id,
+                    unit_of_measurement=UnitOfInformation.GIGABYTES,
+                ),
+                rows,
+            )
+            imported = True
+        if imported:
+            self._store.async_delay_save(lambda: self._imported, SAVE_DELAY)
+
+    def _changed_rows(
+        self, statistic_id: str, series: DailySeries, *, has_sum: bool
+    ) -> list[StatisticData]:
+        """Return the rows of the days that are new or changed since last time."""
+        if not series.starts:
+            return []
+        state = self._imported.setdefault(statistic_id, {"base_sum": 0.0, "days": {}})
+        days: dict[str, float] = state["days"]
+
+        # The series covers the current month, so days before it are final and
+        # only their sum is kept
+        first = series.starts[0]
+        for start in [start for start in days if int(start) < first]:
+            state["base_sum"] += days.pop(start)
+
+        rows = []
+        total = state["base_sum"]
+        changed = False
+        for start, value in zip(series.starts, series.values, strict=True):
+            value_gb = value / BYTES_PER_GB
+            total += value_gb
+            # Once a day changed, the sums of all later days change with it
+            changed = changed or days.get(str(start)) != value_gb
+            if not changed:
+                continue
+            days[str(start)] = value_gb
+            row = StatisticData(start=datetime.fromtimestamp(start, UTC))
+            if has_sum:
+                row["state"] = value_gb
+                row["sum"] = total
+            else:
+                row["mean"] = row["min"] = row["max"] = value_gb
+            rows.append(row)
+            if not has_sum:
+                # Averages do not depend on earlier days
+                changed = False
+        return rows
@@ -1,25 +1,93 @@
-"""Custom types for integration_blueprint."""
+"""Custom types and shared data for integration_blueprint."""
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.hass_dict import HassKey
+
+from .api import IntegrationBlueprintApiClient
+from .const import CONF_NODES, DOMAIN
+
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
     from homeassistant.loader import Integration
 
-    from .api import IntegrationBlueprintApiClient
     from .coordinator import BlueprintDataUpdateCoordinator
 
 
 type IntegrationBlueprintConfigEntry = ConfigEntry[IntegrationBlueprintData]
 
+# One client per node, shared by every entry and flow that talks to it
+DATA_CLIENTS: HassKey[dict[str, IntegrationBlueprintApiClient]] = HassKey(
+    f"{DOMAIN}_clients"
+)
+
 
 @dataclass
 class IntegrationBlueprintData:
     """Data for the Blueprint integration."""
 
-    client: IntegrationBlueprintApiClient
-    coordinator: BlueprintDataUpdateCoordinator
+    coordinators: list[BlueprintDataUpdateCoordinator]
     integration: Integration
+
+
+@callback
+def async_get_client(
+    hass: HomeAssistant, host: str, port: int
+) -> IntegrationBlueprintApiClient:
+    """Return the shared client of a node, so its requests are coalesced."""
+    clients = hass.data.setdefault(DATA_CLIENTS, {})
+    target = f"{host}:{int(port)}"
+    if (client := clients.get(target)) is None:
+        client = clients[target] = IntegrationBlueprintApiClient(
+            host=host,
+            port=port,
+            session=async_get_clientsession(hass),
+        )
+    return client
+
+
+@callback
+def async_release_client(
+    hass: HomeAssistant,
+    target: str,
+    entry: IntegrationBlueprintConfigEntry | None = None,
+) -> None:
+    """Close the shared client of a node once no other entry uses it."""
+    for other in hass.config_entries.async_entries(DOMAIN):
+        # Entries still being set up already hold the client of their nodes
+        if (
+            other.state in (ConfigEntryState.LOADED, ConfigEntryState.SETUP_IN_PROGRESS)
+            and (entry is None or other.entry_id != entry.entry_id)
+            and any(
+                f"{node[CONF_HOST]}:{int(node[CONF_PORT])}" == target
+                for node in other.data.get(CONF_NODES, [other.data])
+            )
+        ):
+            return
+    if (client := hass.data.get(DATA_CLIENTS, {}).pop(target, None)) is not None:
+        client.close()
+
+
+@callback
+def async_get_coordinator(
+    hass: HomeAssistant, node: str
+) -> BlueprintDataUpdateCoordinator | None:
+    """Return the coordinator of a loaded node by its host:port or node ID."""
+    for entry in hass.config_entries.async_loaded_entries(DOMAIN):
+        for coordinator in entry.runtime_data.coordinators:
+            node_id = (
+                coordinator.data["sno"].node_id
+                if coordinator.data is not None and "sno" in coordinator.data
+                else None
+            )
+            if node in (coordinator.client.target, node_id):
+                return coordinator
+    return None
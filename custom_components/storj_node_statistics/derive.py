@@ -0,0 +1,138 @@
+"""Derive all sensor values from the node data in one pass."""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .models import (
+        EstimatedPayout,
+        HeldHistory,
+        NodeStatus,
+        SatelliteScores,
+        SatellitesSummary,
+    )
+
+BYTES_PER_GB = 1000000000
+CENTS_PER_DOLLAR = 100
+MICRO_UNITS_PER_DOLLAR = 1000000
+
+
+def _gb(value: float | None) -> float | None:
+    """Return bytes as rounded gigabytes."""
+    if value is None:
+        return None
+    return round(float(value / BYTES_PER_GB), 2)
+
+
+def _dollars(value: float | None, unit: int = CENTS_PER_DOLLAR) -> float | None:
+    """Return an amount in the given unit as rounded dollars."""
+    if value is None:
+        return None
+    return round(float(value / unit), 2)
+
+
+def _percent(score: float | None) -> float | None:
+    """Return a 0-1 score as a rounded percentage."""
+    if score is None:
+        return None
+    return round(float(score * 100), 2)
+
+
+def satellite_value_key(key: str, satellite_id: str) -> str:
+    """Return the value table key of a per-satellite sensor."""
+    return f"{key}_{satellite_id}"
+
+
+def metric_value_key(selector: str) -> str:
+    """Return the value table key of a sensor of a node debug metric."""
+    return "storj_metric_" + re.sub(r"[^a-z0-9]+", "_", selector.lower()).strip("_")
+
+
+def _uptime(started_at: datetime | None) -> str | None:
+    """Return the time since the node started as "1d 2h 3m"."""
+    if started_at is None:
+        return None
+    uptime = datetime.now(timezone.utc) - started_at
+    hours, remainder = divmod(uptime.seconds, 3600)
+    minutes, _ = divmod(remainder, 60)
+    return f"{uptime.days}d {hours}h {minutes}m"
+
+
+def derive_values(data: dict[str, Any], total_paid: int | None) -> dict[str, Any]:
+    """
+    Return the value of every sensor, keyed by sensor key.
+
+    Endpoints that were not fetched, as no enabled sensor needs them, leave
+    their sensors out.
+    """
+    sno: NodeStatus = data["sno"]
+    disk_total = sno.disk_allocated
+    disk_available = sno.disk_available
+
+    disk_use_percentage = None
+    if disk_total and disk_available is not None:
+        disk_use_percentage = round(
+            float((disk_total - disk_available) / disk_total * 100), 2
+        )
+
+    values = {
+        "storj_diskspace_available": _gb(disk_total),
+        "storj_diskspace_used": _gb(sno.disk_used),
+        "storj_diskspace_trash": _gb(sno.disk_trash),
+        "storj_diskspace_free": _gb(disk_available),
+        "storj_disk_use_percentage": disk_use_percentage,
+        "storj_nodeid": sno.node_id,
+        "storj_wallet": sno.wallet,
+        "storj_quic": sno.quic_status,
+        "storj_uptime": _uptime(sno.started_at),
+        "storj_version": sno.version,
+        "storj_bandwidth_used": _gb(sno.bandwidth_used),
+    }
+
+    satellites: SatellitesSummary | None = data.get("satellites")
+    if satellites is not None:
+        online_scores = satellites.online_scores
+        avg_online_score = (
+            sum(online_scores) / len(online_scores) * 100 if online_scores else 0
+        )
+        values["storj_average_usage_bytes"] = _gb(satellites.average_usage_bytes)
+        values["storj_bandwidth_egress"] = _gb(satellites.egress_summary)
+        values["storj_bandwidth_ingress"] = _gb(satellites.ingress_summary)
+        values["storj_satellite_avg_online"] = round(float(avg_online_score), 2)
+
+    estimated_payout: EstimatedPayout | None = data.get("estimated-payout")
+    if estimated_payout is not None:
+        payout = estimated_payout.payout
+        held = estimated_payout.held
+        pay_total = None
+        if payout is not None and held is not None:
+            pay_total = _dollars(payout + held)
+        values["storj_current_month_payout"] = _dollars(payout)
+        values["storj_current_month_held"] = _dollars(held)
+        values["storj_current_month_pay_total"] = pay_total
+
+    held_history: HeldHistory | None = data.get("held_history")
+    if held_history is not None:
+        values["storj_total_held"] = _dollars(
+            held_history.total_held, MICRO_UNITS_PER_DOLLAR
+        )
+
+    if total_paid is not None:
+        values["storj_total_earned"] = _dollars(total_paid, MICRO_UNITS_PER_DOLLAR)
+
+    scores: SatelliteScores
+    for satellite_id, scores in data.get("satellite", {}).items():
+        for key, score in (
+            ("storj_satellite_audit", scores.audit_score),
+            ("storj_satellite_suspension", scores.suspension_score),
+            ("storj_satellite_online", scores.online_score),
+        ):
+            values[satellite_value_key(key, satellite_id)] = _percent(score)
+
+    for selector, value in data.get("metrics", {}).items():
+        values[metric_value_key(selector)] = value
+
+    return values
@@ -0,0 +1,36 @@
+"""Diagnostics support for storj_node_statistics."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from .const import CONF_WEBHOOK_ID
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import IntegrationBlueprintConfigEntry
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    entry: IntegrationBlueprintConfigEntry,
+) -> dict[str, Any]:
+    """Return the request metrics of every node of an entry."""
+    return {
+        "data": async_redact_data(entry.data, {CONF_WEBHOOK_ID}),
+        "options": dict(entry.options),
+        "nodes": {
+            coordinator.client.target: {
+                "last_update_success": coordinator.last_update_success,
+                "skipped_writes": coordinator.skipped_writes,
+                "endpoints": {
+                    endpoint: metrics.as_dict()
+                    for endpoint, metrics in coordinator.client.metrics.items()
+                },
+            }
+            for coordinator in entry.runtime_data.coordinators
+        },
+    }
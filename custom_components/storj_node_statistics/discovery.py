@@ -0,0 +1,87 @@
+"""Scan of a subnet and port range for storage nodes."""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+from .const import ENDPOINTS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# Nodes on the local network accept a connection within milliseconds, most
+# probed addresses have no host, so the connect timeout bounds the scan time
+PROBE_CONNECT_TIMEOUT = 0.5
+PROBE_TIMEOUT = 3
+SCAN_CONCURRENCY = 256
+# A /22 with 20 ports, larger scans are refused
+MAX_PROBES = 1024 * 20
+
+
+def parse_port_range(ports: str) -> range:
+    """Parse a port or a port range such as 14002-14020."""
+    first, _, last = ports.partition("-")
+    port_range = range(int(first), int(last or first) + 1)
+    if not port_range or port_range[0] < 1 or port_range[-1] > 65535:
+        raise ValueError(ports)
+    return port_range
+
+
+def scan_targets(subnet: str, ports: range) -> list[tuple[str, int]]:
+    """Return the host and port pairs to probe, refusing too large scans."""
+    network = ipaddress.ip_network(subnet.strip(), strict=False)
+    if network.num_addresses * len(ports) > MAX_PROBES:
+        msg = f"{subnet} with {len(ports)} ports is more than {MAX_PROBES} probes"
+        raise ValueError(msg)
+    hosts = list(network.hosts()) or [network.network_address]
+    return [(str(host), port) for host in hosts for port in ports]
+
+
+async def _async_probe(
+    session: aiohttp.ClientSession, host: str, port: int
+) -> str | None:
+    """Return the node ID answering at a host and port, if any."""
+    try:
+        async with session.get(
+            f"http://{host}:{port}{ENDPOINTS['sno']}",
+            timeout=aiohttp.ClientTimeout(
+                total=PROBE_TIMEOUT, sock_connect=PROBE_CONNECT_TIMEOUT
+            ),
+        ) as response:
+            if response.status != HTTPStatus.OK:
+                return None
+            payload = await response.json(content_type=None)
+    except (aiohttp.ClientError, TimeoutError, ValueError):
+        return None
+    node_id = payload.get("nodeID") if isinstance(payload, dict) else None
+    return node_id if isinstance(node_id, str) and node_id else None
+
+
+async def async_scan(
+    session: aiohttp.ClientSession,
+    targets: list[tuple[str, int]],
+    concurrency: int = SCAN_CONCURRENCY,
+) -> dict[str, str]:
+    """
+    Probe targets concurrently and return the node IDs found by host:port.
+
+    A fixed number of workers take targets from a shared iterator, so at most
+    concurrency connections are open and no task is created per target.
+    """
+    found: dict[str, str] = {}
+    pending: Iterator[tuple[str, int]] = iter(targets)
+
+    async def _async_worker() -> None:
+        for host, port in pending:
+            if node_id := await _async_probe(session, host, port):
+                found[f"{host}:{port}"] = node_id
+
+    await asyncio.gather(
+        *(_async_worker() for _ in range(min(concurrency, len(targets))))
+    )
+    return found
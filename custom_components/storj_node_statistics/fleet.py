@@ -0,0 +1,185 @@
+"""Aggregates of sensor values over the nodes of a fleet entry."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .coordinator import BlueprintDataUpdateCoordinator
+
+SUM = "sum"
+MIN = "min"
+MAX = "max"
+
+
+class FleetAggregator:
+    """
+    Sums, minimums and maximums of node values, updated node by node.
+
+    A node contributes while its last refresh succeeded. Its values are
+    removed when a refresh fails, so an unreachable node is neither counted
+    as zero nor with values that are out of date, and is listed instead.
+    Data restored at startup only contributes once a refresh or push
+    confirmed the node is live.
+    Sums are adjusted by the change of a value, extremes are only searched
+    for again when the node holding one changed.
+    """
+
+    def __init__(
+        self,
+        coordinators: list[BlueprintDataUpdateCoordinator],
+        aggregates: dict[str, tuple[str, str]],
+    ) -> None:
+        """Initialize from aggregate keys to the value key and kind they take."""
+        self._coordinators = coordinators
+        self._aggregates = aggregates
+        self._value_keys = {value_key for value_key, _ in aggregates.values()}
+        # Contributed values by value key and node, and their running sums
+        self._node_values: dict[str, dict[str, float]] = {
+            key: {} for key in self._value_keys
+        }
+        self._sums: dict[str, float] = dict.fromkeys(self._value_keys, 0.0)
+        # Minimum and maximum aggregates by value key, with their extremes and
+        # those whose extreme was replaced and must be searched for again
+        self._extreme_keys: dict[str, list[str]] = {}
+        for key, (value_key, kind) in aggregates.items():
+            if kind != SUM:
+                self._extreme_keys.setdefault(value_key, []).append(key)
+        self._extremes: dict[str, float | None] = dict.fromkeys(aggregates)
+        self._stale_extremes: set[str] = set()
+        self.reporting: set[str] = set()
+        self.values: dict[str, float | None] = dict.fromkeys(aggregates)
+        self.changed_keys: set[str] = set()
+        self._listeners: list[Callable[[], None]] = []
+
+    @property
+    def unavailable(self) -> list[str]:
+        """Return the nodes whose values are not part of the aggregates."""
+        return sorted(
+            coordinator.client.target
+            for coordinator in self._coordinators
+            if coordinator.client.target not in self.reporting
+        )
+
+    def contributors(self, key: str) -> int:
+        """Return the number of nodes with a value for an aggregate."""
+        return len(self._node_values[self._aggregates[key][0]])
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Take the current values and follow the updates of every node."""
+        for coordinator in self._coordinators:
+            self._update_node(coordinator)
+        self._update_aggregates(self._value_keys)
+        removers = [
+            coordinator.async_add_listener(
+                lambda coordinator=coordinator: self._async_node_updated(coordinator)
+            )
+            for coordinator in self._coordinators
+        ]
+
+        @callback
+        def _async_stop() -> None:
+            for remove in removers:
+                remove()
+
+        return _async_stop
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Call back after an update of a node, until the callback is called."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def _async_remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return _async_remove_listener
+
+    @callback
+    def _async_node_updated(self, coordinator: BlueprintDataUpdateCoordinator) -> None:
+        """Apply the values of one node that changed and notify the sensors."""
+        was_reporting = coordinator.client.target in self.reporting
+        touched = self._update_node(coordinator)
+        self.changed_keys = self._update_aggregates(touched)
+        if was_reporting != (coordinator.client.target in self.reporting):
+            # The node counts of every aggregate changed
+            self.changed_keys.update(self._aggregates)
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    def _update_node(self, coordinator: BlueprintDataUpdateCoordinator) -> set[str]:
+        """Replace the contributions of a node, returning the value keys touched."""
+        node = coordinator.client.target
+        if (
+            coordinator.last_update_success
+            and coordinator.data is not None
+            and not coordinator.stale
+        ):
+            keys = (
+                self._value_keys & coordinator.changed_keys
+                if node in self.reporting
+                else self._value_keys
+            )
+            self.reporting.add(node)
+            for key in keys:
+                self._set(key, node, coordinator.values.get(key))
+            return keys
+        if node not in self.reporting:
+            return set()
+        self.reporting.discard(node)
+        for key in self._value_keys:
+            self._set(key, node, None)
+        return set(self._value_keys)
+
+    def _set(self, key: str, node: str, value: Any) -> None:
+        """Set the contribution of a node to a value, None to remove it."""
+        values = self._node_values[key]
+        if (previous := values.pop(node, None)) is not None:
+            self._sums[key] -= previous
+        if not isinstance(value, int | float):
+            value = None
+        else:
+            values[node] = value
+            self._sums[key] += value
+        for aggregate in self._extreme_keys.get(key, ()):
+            extreme = self._extremes[aggregate]
+            if previous is not None and previous == extreme:
+                self._stale_extremes.add(aggregate)
+            if value is not None and (
+                extreme is None
+                or (
+                    value < extreme
+                    if self._aggregates[aggregate][1] == MIN
+                    else value > extreme
+                )
+            ):
+                self._extremes[aggregate] = value
+
+    def _update_aggregates(self, value_keys: set[str]) -> set[str]:
+        """Update the aggregates of value keys, returning those that changed."""
+        changed: set[str] = set()
+        for key, (value_key, kind) in self._aggregates.items():
+            if value_key not in value_keys:
+                continue
+            values = self._node_values[value_key]
+            if kind != SUM and key in self._stale_extremes:
+                self._stale_extremes.discard(key)
+                self._extremes[key] = (
+                    (min if kind == MIN else max)(values.values()) if values else None
+                )
+            if not values:
+                value = None
+            elif kind == SUM:
+                # Running sums drift by float rounding, values have two decimals
+                value = round(self._sums[value_key], 2)
+            else:
+                value = self._extremes[key]
+            if value != self.values[key]:
+                self.values[key] = value
+                changed.add(key)
+        return changed
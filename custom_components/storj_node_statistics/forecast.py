@@ -0,0 +1,320 @@
+"""Trends of the daily series of a node, forecasting its payout and disk."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .derive import BYTES_PER_GB, CENTS_PER_DOLLAR
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from homeassistant.core import HomeAssistant
+
+    from .models import DailySeries, EstimatedPayout, NodeStatus, SatellitesSummary
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+SECONDS_PER_DAY = 86400
+HOURS_PER_DAY = 24
+# Days a trend is fitted to, and the fewest it is fitted with
+WINDOW_DAYS = 30
+MIN_DAYS = 3
+# Disks filling up later than this are not forecast a date
+MAX_DAYS = 3650
+# Two-sided 95% quantiles of Student's t by degrees of freedom, the normal
+# quantile beyond the table
+T_95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)  # fmt: skip
+Z_95 = 1.960
+
+# Trend name and the daily series of the satellites summary it is fitted to
+TRENDS: tuple[tuple[str, str], ...] = (
+    ("storage", "storage_daily"),
+    ("egress", "egress_daily"),
+)
+
+
+def _t_95(degrees: int) -> float:
+    """Return the 95% quantile of Student's t."""
+    return T_95[degrees - 1] if degrees <= len(T_95) else Z_95
+
+
+@dataclass(frozen=True, slots=True)
+class Trend:
+    """Least squares line of a value per day, with its residual variance."""
+
+    count: int
+    mean_day: float
+    mean: float
+    # Change of the value per day
+    slope: float
+    variance: float
+    # Sum of the squared deviations of the days from their mean
+    spread: float
+
+    def at(self, day: float) -> float:
+        """Return the value of the line on a day."""
+        return self.mean + self.slope * (day - self.mean_day)
+
+    def slope_margin(self) -> float:
+        """Return the half width of the 95% interval of the slope."""
+        return _t_95(self.count - 2) * math.sqrt(self.variance / self.spread)
+
+    def total(self, days: Iterable[tuple[float, float]]) -> tuple[float, float]:
+        """
+        Return the predicted sum of weighted days and its 95% margin.
+
+        The margin covers the uncertainty of the line, shared by every day,
+        and the scatter of the days around it, independent from day to day.
+        """
+        total = weights = offsets = squared_weights = 0.0
+        for day, weight in days:
+            total += weight * self.at(day)
+            weights += weight
+            offsets += weight * (day - self.mean_day)
+            squared_weights += weight * weight
+        variance = self.variance * (
+            weights * weights / self.count
+            + offsets * offsets / self.spread
+            + squared_weights
+        )
+        return total, _t_95(self.count - 2) * math.sqrt(variance)
+
+
+class TrendFit:
+    """
+    Least squares fit of the last days of a daily series.
+
+    Days are added one at a time and the oldest dropped past the window, by
+    adjusting running sums instead of fitting every day again. Days and
+    values are summed relative to the first day added, so the sums of
+    squares of large byte counts do not lose the variance to rounding.
+    """
+
+    def __init__(self, window: int = WINDOW_DAYS) -> None:
+        """Initialize."""
+        self._window = window
+        self.points: deque[tuple[float, float]] = deque()
+        self._origin: tuple[float, float] | None = None
+        self._sum_x = self._sum_y = self._sum_xx = self._sum_xy = self._sum_yy = 0.0
+
+    @property
+    def last_day(self) -> float | None:
+        """Return the last day added."""
+        return self.points[-1][0] if self.points else None
+
+    def add(self, day: float, value: float) -> None:
+        """Add the value of a day after the last one, dropping the oldest."""
+        if self._origin is None:
+            self._origin = (day, value)
+        self.points.append((day, value))
+        self._accumulate(day, value, 1)
+        if len(self.points) > self._window:
+            self._accumulate(*self.points.popleft(), -1)
+
+    def _accumulate(self, day: float, value: float, sign: int) -> None:
+        """Add a point to the running sums, or remove it."""
+        origin_day, origin_value = self._origin or (0.0, 0.0)
+        x = day - origin_day
+        y = value - origin_value
+        self._sum_x += sign * x
+        self._sum_y += sign * y
+        self._sum_xx += sign * x * x
+        self._sum_xy += sign * x * y
+        self._sum_yy += sign * y * y
+
+    def trend(self) -> Trend | None:
+        """Return the fitted line, None while there are too few days."""
+        count = len(self.points)
+        if count < MIN_DAYS or self._origin is None:
+            return None
+        mean_x = self._sum_x / count
+        mean_y = self._sum_y / count
+        spread = self._sum_xx - count * mean_x * mean_x
+        if spread <= 0:
+            return None
+        slope = (self._sum_xy - count * mean_x * mean_y) / spread
+        residuals = self._sum_yy - count * mean_y * mean_y - slope * slope * spread
+        return Trend(
+            count=count,
+            mean_day=mean_x + self._origin[0],
+            mean=mean_y + self._origin[1],
+            slope=slope,
+            variance=max(residuals, 0.0) / (count - 2),
+            spread=spread,
+        )
+
+
+def _month_days(now: datetime) -> list[tuple[float, float]]:
+    """Return the days left in the month of now, weighted by what is left."""
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    month_end = (today.replace(day=1) + timedelta(days=32)).replace(day=1)
+    left_today = 1 - (now - today).total_seconds() / SECONDS_PER_DAY
+    start = today.timestamp() / SECONDS_PER_DAY
+    return [
+        (start + index, left_today if index == 0 else 1.0)
+        for index in range((month_end - today).days)
+    ]
+
+
+def payout_forecast(
+    estimated: EstimatedPayout,
+    storage: Trend,
+    egress: Trend,
+    now: datetime,
+) -> tuple[float, float, float] | None:
+    """
+    Return the month-end payout in cents and its 95% bounds.
+
+    The rest of the month is paid at the rates the month paid so far, for
+    the storage and egress of the trends. Held back amounts and bonuses
+    scale with the storage and egress payouts as they did so far.
+    """
+    if (
+        estimated.payout is None
+        or estimated.egress_payout is None
+        or estimated.disk_space_payout is None
+        or not estimated.egress_bytes
+        or not estimated.disk_space
+    ):
+        return None
+    paid = estimated.egress_payout + estimated.disk_space_payout
+    if not paid:
+        return None
+    # Cents per byte sent, and per byte stored for a day
+    egress_rate = estimated.egress_payout / estimated.egress_bytes
+    storage_rate = estimated.disk_space_payout / estimated.disk_space * HOURS_PER_DAY
+    share = estimated.payout / paid
+    days = _month_days(now)
+    egress_total, egress_margin = egress.total(days)
+    storage_total, storage_margin = storage.total(days)
+    forecast = estimated.payout + share * (
+        egress_rate * max(egress_total, 0.0) + storage_rate * max(storage_total, 0.0)
+    )
+    # The margins of the two trends are taken as independent
+    margin = share * math.hypot(
+        egress_rate * egress_margin, storage_rate * storage_margin
+    )
+    return forecast, max(forecast - margin, estimated.payout), forecast + margin
+
+
+def disk_full_forecast(
+    free: float, storage: Trend, now: datetime
+) -> tuple[datetime | None, datetime | None, datetime | None]:
+    """
+    Return when the free space runs out at the storage trend, and 95% bounds.
+
+    None means the disk does not fill up within ten years at that growth,
+    or the stored data is not growing at all.
+    """
+
+    def _at(growth: float) -> datetime | None:
+        if growth <= 0 or free / growth > MAX_DAYS:
+            return None
+        # Rounded to the hour, as the free space changes on every refresh
+        full = now + timedelta(days=free / growth)
+        return full.replace(minute=0, second=0, microsecond=0) + timedelta(
+            hours=full.minute >= 30
+        )
+
+    margin = storage.slope_margin()
+    return (
+        _at(storage.slope),
+        _at(storage.slope + margin),
+        _at(storage.slope - margin),
+    )
+
+
+class NodeForecast:
+    """Trends of the storage and egress of a node, kept across restarts."""
+
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{key}.forecast"
+        )
+        self.fits: dict[str, TrendFit] = {name: TrendFit() for name, _ in TRENDS}
+        self._last_summary: SatellitesSummary | None = None
+
+    async def async_load(self) -> None:
+        """Load the days fitted before from disk."""
+        if (stored := await self._store.async_load()) is None:
+            return
+        for name, fit in self.fits.items():
+            for day, value in stored.get(name, []):
+                fit.add(day, value)
+
+    async def async_save(self) -> None:
+        """Write the fitted days now instead of after the save delay."""
+        await self._store.async_save(self._to_save())
+
+    def _to_save(self) -> dict[str, Any]:
+        """Return the days in the fits to store."""
+        return {name: list(fit.points) for name, fit in self.fits.items()}
+
+    @callback
+    def async_add_days(self, summary: SatellitesSummary, now: datetime) -> None:
+        """
+        Add the days of a newly fetched summary completed since the last.
+
+        Days before the current month stay in the fits, so the trends keep
+        their window when the node starts a new month of daily series.
+        """
+        if summary is self._last_summary:
+            return
+        self._last_summary = summary
+        added = False
+        now_timestamp = now.timestamp()
+        for name, attribute in TRENDS:
+            series: DailySeries = getattr(summary, attribute)
+            fit = self.fits[name]
+            for start, value in zip(series.starts, series.values, strict=True):
+                day = start / SECONDS_PER_DAY
+                if start + SECONDS_PER_DAY > now_timestamp:
+                    break
+                if fit.last_day is None or day > fit.last_day:
+                    fit.add(day, value)
+                    added = True
+        if added:
+            self._store.async_delay_save(self._to_save, SAVE_DELAY)
+
+    def values(self, data: dict[str, Any], now: datetime) -> dict[str, Any]:
+        """Return the values of the forecast sensors, keyed by sensor key."""
+        values: dict[str, Any] = {}
+        storage = self.fits["storage"].trend()
+        egress = self.fits["egress"].trend()
+        estimated: EstimatedPayout | None = data.get("estimated-payout")
+        if estimated is not None and storage is not None and egress is not None:
+            payout = payout_forecast(estimated, storage, egress, now)
+            forecast, lower, upper = payout or (None, None, None)
+            values["storj_payout_forecast"] = _dollars(forecast)
+            values["storj_payout_forecast_lower"] = _dollars(lower)
+            values["storj_payout_forecast_upper"] = _dollars(upper)
+        sno: NodeStatus = data["sno"]
+        if storage is not None and sno.disk_available is not None:
+            full, earliest, latest = disk_full_forecast(
+                sno.disk_available, storage, now
+            )
+            values["storj_disk_full"] = full
+            values["storj_disk_full_earliest"] = earliest
+            values["storj_disk_full_latest"] = latest
+            values["storj_disk_full_growth"] = round(storage.slope / BYTES_PER_GB, 2)
+        return values
+
+
+def _dollars(cents: float | None) -> float | None:
+    """Return cents as rounded dollars."""
+    return None if cents is None else round(cents / CENTS_PER_DOLLAR, 2)
@@ -0,0 +1,139 @@
+"""Persistent cache of the payout history of a node."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .models import HeldHistory
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+    from .models import Paystub
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+# Paystubs of a period are published during the following month, so a period
+# is only treated as final once a whole month has passed after it
+FINISHED_AFTER_MONTHS = 2
+FIRST_PERIOD = 2000 * 12
+
+
+def _period_index(period: str) -> int:
+    """Return the month index of a "YYYY-MM" period."""
+    year, month = period.split("-")[:2]
+    return int(year) * 12 + int(month) - 1
+
+
+def _period_name(index: int) -> str:
+    """Return the "YYYY-M" period of a month index, as the node API expects."""
+    year, month = divmod(index, 12)
+    return f"{year}-{month + 1}"
+
+
+def _current_period() -> int:
+    """Return the month index of the current period."""
+    now = dt_util.utcnow()
+    return now.year * 12 + now.month - 1
+
+
+class PayoutHistoryCache:
+    """Paystub totals of finished periods and the latest held history."""
+
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{key}.history"
+        )
+        self._complete_through: int | None = None
+        self._paid: dict[str, int] = {}
+        self.finished_paid = 0
+        self.held_history: HeldHistory | None = None
+        self.held_history_fetched: datetime | None = None
+
+    async def async_load(self) -> None:
+        """Load the cache from disk."""
+        if (stored := await self._store.async_load()) is None:
+            return
+        self._complete_through = stored.get("complete_through")
+        self._paid = stored.get("paid", {})
+        self.finished_paid = stored.get("finished_paid", sum(self._paid.values()))
+        if held_history := stored.get("held_history"):
+            self.held_history = HeldHistory(**held_history)
+        if fetched := stored.get("held_history_fetched"):
+            self.held_history_fetched = dt_util.parse_datetime(fetched)
+
+    def paystubs_path(self, *, complete: bool = False) -> str:
+        """Return the paystubs path of the periods not cached yet, or of all."""
+        start = (
+            FIRST_PERIOD
+            if complete or self._complete_through is None
+            else self._complete_through + 1
+        )
+        end = _current_period()
+        return f"/api/heldamount/paystubs/{_period_name(start)}/{_period_name(end)}"
+
+    def add_paystubs(self, paystubs: list[Paystub]) -> list[Paystub]:
+        """Cache finished periods and return the paystubs of the open ones."""
+        finished_through = _current_period() - FINISHED_AFTER_MONTHS
+        open_paystubs: list[Paystub] = []
+        finished: dict[str, int] = {}
+        for paystub in paystubs:
+            index = _period_index(paystub.period)
+            if index > finished_through:
+                open_paystubs.append(paystub)
+                continue
+            period = _period_name(index)
+            finished[period] = finished.get(period, 0) + paystub.paid
+
+        if self._complete_through is None or finished_through > self._complete_through:
+            # The fetched range started right after the cached periods, so the
+            # finished periods in it are complete and never fetched again
+            self._paid.update(finished)
+            self.finished_paid += sum(finished.values())
+            self._complete_through = finished_through
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+        return open_paystubs
+
+    def set_finished_paid(self, finished_paid: int) -> None:
+        """Take the finished total of a node whose paystubs are cached elsewhere."""
+        if finished_paid != self.finished_paid:
+            self.finished_paid = finished_paid
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def total_paid(self, open_paystubs: list[Paystub]) -> int:
+        """Return the total paid over finished and open periods."""
+        return self.finished_paid + sum(paystub.paid for paystub in open_paystubs)
+
+    def set_held_history(self, held_history: HeldHistory) -> None:
+        """Cache the latest held history."""
+        self.held_history = held_history
+        self.held_history_fetched = dt_util.utcnow()
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    async def async_save(self) -> None:
+        """Write the cache now instead of after the save delay."""
+        await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {
+            "complete_through": self._complete_through,
+            "paid": self._paid,
+            "finished_paid": self.finished_paid,
+            "held_history": (asdict(self.held_history) if self.held_history else None),
+            "held_history_fetched": (
+                self.held_history_fetched.isoformat()
+                if self.held_history_fetched
+                else None
+            ),
+        }
@@ -0,0 +1,98 @@
+"""Request metrics of the node API endpoints."""
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+# Upper bounds of the latency histogram buckets in seconds, the last bucket
+# counts everything slower
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass(slots=True)
+class EndpointMetrics:
+    """Requests, latency and errors of one endpoint of one node."""
+
+    requests: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    latency_buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+    latency_total: float = 0.0
+    last_latency: float | None = None
+    response_bytes: int = 0
+    last_response_bytes: int | None = None
+    decode_total: float = 0.0
+    last_success: datetime | None = None
+    last_timed_out: bool = False
+
+    @property
+    def successes(self) -> int:
+        """Return the number of successful requests."""
+        return self.requests - self.errors
+
+    def record_success(self, latency: float, size: int, decode_time: float) -> None:
+        """Record a request that returned a decoded response."""
+        self.requests += 1
+        self.latency_buckets[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.latency_total += latency
+        self.last_latency = latency
+        self.response_bytes += size
+        self.last_response_bytes = size
+        self.decode_total += decode_time
+        self.last_success = datetime.now(UTC)
+        self.last_timed_out = False
+
+    def record_error(self, *, timeout: bool = False) -> None:
+        """Record a failed request."""
+        self.requests += 1
+        self.errors += 1
+        self.last_timed_out = timeout
+        if timeout:
+            self.timeouts += 1
+
+    def latency_percentile(self, quantile: float) -> float | None:
+        """
+        Return an upper bound of a latency percentile of the successes.
+
+        Slower requests than the last bucket bound are reported at that bound.
+        """
+        if not self.successes:
+            return None
+        rank = quantile * self.successes
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets, strict=False):
+            seen += count
+            if seen >= rank:
+                return bound
+        return LATENCY_BUCKETS[-1]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics and sensor attributes."""
+        successes = self.successes
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "latency_histogram": dict(
+                zip(
+                    [*(f"le_{bound}" for bound in LATENCY_BUCKETS), "slower"],
+                    self.latency_buckets,
+                    strict=True,
+                )
+            ),
+            "latency_p50": self.latency_percentile(0.5),
+            "latency_p95": self.latency_percentile(0.95),
+            "latency_mean": self.latency_total / successes if successes else None,
+            "last_latency": self.last_latency,
+            "response_bytes": self.response_bytes,
+            "last_response_bytes": self.last_response_bytes,
+            "decode_time_mean": self.decode_total / successes if successes else None,
+            "last_success": (
+                self.last_success.isoformat() if self.last_success else None
+            ),
+        }
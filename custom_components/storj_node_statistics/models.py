@@ -0,0 +1,342 @@
+"""Compact records parsed from the node API responses."""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+@dataclass(slots=True)
+class NodeStatus:
+    """Fields used from /api/sno/."""
+
+    node_id: str | None
+    wallet: str | None
+    quic_status: str | None
+    version: str | None
+    started_at: datetime | None
+    disk_allocated: int | None
+    disk_available: int | None
+    disk_used: int | None
+    disk_trash: int | None
+    bandwidth_used: int | None
+    satellites: dict[str, str]
+
+
+@dataclass(slots=True)
+class DailySeries:
+    """One value per day, as parallel arrays of day starts and values."""
+
+    # Unix timestamps of the starts of the days in UTC
+    starts: array[int]
+    values: array[float]
+
+
+@dataclass(slots=True)
+class SatellitesSummary:
+    """Fields used from /api/sno/satellites."""
+
+    average_usage_bytes: float | None
+    egress_summary: int | None
+    ingress_summary: int | None
+    online_scores: tuple[float, ...]
+    # Average bytes stored, and bytes sent and received on each day of the month
+    storage_daily: DailySeries
+    egress_daily: DailySeries
+    ingress_daily: DailySeries
+
+
+@dataclass(slots=True)
+class SatelliteScores:
+    """Fields used from /api/sno/satellite/{id}."""
+
+    audit_score: float | None
+    suspension_score: float | None
+    online_score: float | None
+    # The daily series of the node on this satellite only
+    storage_daily: DailySeries
+    egress_daily: DailySeries
+    ingress_daily: DailySeries
+
+
+@dataclass(slots=True)
+class EstimatedPayout:
+    """Fields used from /api/sno/estimated-payout."""
+
+    payout: float | None
+    held: float | None
+    # Bytes sent and byte-hours stored this month, and what they paid
+    egress_bytes: int | None = None
+    egress_payout: float | None = None
+    disk_space: float | None = None
+    disk_space_payout: float | None = None
+
+
+@dataclass(slots=True)
+class HeldHistory:
+    """Fields used from /api/heldamount/held-history."""
+
+    total_held: int
+
+
+@dataclass(slots=True)
+class Paystub:
+    """Fields used from one paystub of /api/heldamount/paystubs."""
+
+    period: str
+    paid: int
+
+
+def _parse_datetime(value: str | None) -> datetime | None:
+    """Parse a timestamp of the node API."""
+    if value is None:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _parse_daily(
+    items: list[dict[str, Any]] | None, value: Callable[[dict[str, Any]], float]
+) -> DailySeries:
+    """Parse a daily series of the node API into arrays."""
+    series = DailySeries(starts=array("q"), values=array("d"))
+    for item in items or []:
+        started = _parse_datetime(item.get("intervalStart"))
+        if started is None:
+            continue
+        series.starts.append(int(started.timestamp()))
+        series.values.append(float(value(item)))
+    return series
+
+
+def _traffic(item: dict[str, Any], direction: str) -> float:
+    """Return the bytes of all kinds of traffic in a direction of a day."""
+    return sum((item.get(direction) or {}).values())
+
+
+def _parse_usage_daily(
+    payload: dict[str, Any],
+) -> tuple[DailySeries, DailySeries, DailySeries]:
+    """Parse the daily storage, egress and ingress of a satellites response."""
+    bandwidth_daily = payload.get("bandwidthDaily")
+    return (
+        _parse_daily(
+            payload.get("storageDaily"), lambda item: item["atRestTotalBytes"]
+        ),
+        _parse_daily(bandwidth_daily, lambda item: _traffic(item, "egress")),
+        _parse_daily(bandwidth_daily, lambda item: _traffic(item, "ingress")),
+    )
+
+
+def parse_node_status(payload: dict[str, Any]) -> NodeStatus:
+    """Parse /api/sno/."""
+    disk_space = payload.get("diskSpace") or {}
+    return NodeStatus(
+        node_id=payload.get("nodeID"),
+        wallet=payload.get("wallet"),
+        quic_status=payload.get("quicStatus"),
+        version=payload.get("version"),
+        started_at=_parse_datetime(payload.get("startedAt")),
+        disk_allocated=disk_space.get("allocated"),
+        disk_available=disk_space.get("available"),
+        disk_used=disk_space.get("used"),
+        disk_trash=disk_space.get("trash"),
+        bandwidth_used=(payload.get("bandwidth") or {}).get("used"),
+        satellites={
+            satellite["id"]: satellite["url"]
+            for satellite in payload.get("satellites") or []
+        },
+    )
+
+
+def parse_satellites_summary(payload: dict[str, Any]) -> SatellitesSummary:
+    """Parse /api/sno/satellites."""
+    storage_daily, egress_daily, ingress_daily = _parse_usage_daily(payload)
+    return SatellitesSummary(
+        average_usage_bytes=payload.get("averageUsageBytes"),
+        egress_summary=payload.get("egressSummary"),
+        ingress_summary=payload.get("ingressSummary"),
+        online_scores=tuple(
+            audit["onlineScore"] for audit in payload.get("audits") or []
+        ),
+        storage_daily=storage_daily,
+        egress_daily=egress_daily,
+        ingress_daily=ingress_daily,
+    )
+
+
+def parse_satellite_scores(payload: dict[str, Any]) -> SatelliteScores:
+    """Parse /api/sno/satellite/{id}."""
+    audits = payload.get("audits") or {}
+    storage_daily, egress_daily, ingress_daily = _parse_usage_daily(payload)
+    return SatelliteScores(
+        audit_score=audits.get("auditScore"),
+        suspension_score=audits.get("suspensionScore"),
+        online_score=audits.get("onlineScore"),
+        storage_daily=storage_daily,
+        egress_daily=egress_daily,
+        ingress_daily=ingress_daily,
+    )
+
+
+def _sum_present(payload: dict[str, Any], *keys: str) -> float | None:
+    """Return the sum of the fields present in a payload, None if none are."""
+    values = [payload[key] for key in keys if payload.get(key) is not None]
+    return sum(values) if values else None
+
+
+def parse_estimated_payout(payload: dict[str, Any]) -> EstimatedPayout:
+    """Parse /api/sno/estimated-payout."""
+    current_month = payload.get("currentMonth") or {}
+    return EstimatedPayout(
+        payout=current_month.get("payout"),
+        held=current_month.get("held"),
+        egress_bytes=_sum_present(
+            current_month, "egressBandwidth", "egressRepairAudit"
+        ),
+        egress_payout=_sum_present(
+            current_month, "egressBandwidthPayout", "egressRepairAuditPayout"
+        ),
+        disk_space=current_month.get("diskSpace"),
+        disk_space_payout=current_month.get("diskSpacePayout"),
+    )
+
+
+def parse_held_history(payload: list[dict[str, Any]] | None) -> HeldHistory:
+    """Parse /api/heldamount/held-history."""
+    return HeldHistory(total_held=sum(item["totalHeld"] for item in payload or []))
+
+
+def parse_paystubs(payload: list[dict[str, Any]] | None) -> list[Paystub]:
+    """Parse /api/heldamount/paystubs."""
+    return [Paystub(period=item["period"], paid=item["paid"]) for item in payload or []]
+
+
+# Parser of each endpoint, keyed like the coordinator data
+PARSERS: dict[str, Callable[[Any], Any]] = {
+    "sno": parse_node_status,
+    "satellites": parse_satellites_summary,
+    "satellite": parse_satellite_scores,
+    "estimated-payout": parse_estimated_payout,
+    "held_history": parse_held_history,
+    "paystubs": parse_paystubs,
+}
+
+
+# Record type of each endpoint, for restoring stored records
+RECORD_TYPES: dict[str, type] = {
+    "sno": NodeStatus,
+    "satellites": SatellitesSummary,
+    "satellite": SatelliteScores,
+    "estimated-payout": EstimatedPayout,
+    "held_history": HeldHistory,
+    "paystubs": Paystub,
+}
+
+
+# Types the values of record fields may have, by annotation without None.
+# Datetimes and daily series are checked while they are loaded
+_FIELD_TYPES: dict[str, tuple[type, ...]] = {
+    "str": (str,),
+    "int": (int, float),
+    "float": (int, float),
+    "dict[str, str]": (dict,),
+    "tuple[float, ...]": (tuple,),
+}
+
+
+def check_record(record: Any) -> None:
+    """Raise TypeError if a field of a record loaded from elsewhere is mistyped."""
+    for field in fields(record):
+        value = getattr(record, field.name)
+        annotation = str(field.type).removesuffix(" | None")
+        if value is None and annotation != field.type:
+            continue
+        values = [value]
+        if annotation == "dict[str, str]" and isinstance(value, dict):
+            values, annotation = [*value, *value.values()], "str"
+        elif annotation == "tuple[float, ...]" and isinstance(value, tuple):
+            values, annotation = list(value), "float"
+        if (types := _FIELD_TYPES.get(annotation)) is not None and any(
+            isinstance(item, bool) or not isinstance(item, types) for item in values
+        ):
+            msg = f"{type(record).__name__}.{field.name} is {value!r}"
+            raise TypeError(msg)
+
+
+def _dump_record(record: Any) -> dict[str, Any]:
+    """Return a record as JSON compatible fields."""
+    fields = asdict(record)
+    if isinstance(record, NodeStatus) and record.started_at is not None:
+        fields["started_at"] = record.started_at.isoformat()
+    for name, value in fields.items():
+        if isinstance(value, dict) and "starts" in value:
+            fields[name] = {key: series.tolist() for key, series in value.items()}
+    return fields
+
+
+def _load_series(fields: dict[str, list] | None) -> DailySeries:
+    """Return a daily series from its dumped lists."""
+    fields = fields or {"starts": [], "values": []}
+    return DailySeries(
+        starts=array("q", fields["starts"]), values=array("d", fields["values"])
+    )
+
+
+def _load_record(record_type: type, fields: dict[str, Any]) -> Any:
+    """Return a record from fields returned by _dump_record."""
+    if record_type is NodeStatus:
+        fields = {**fields, "started_at": _parse_datetime(fields["started_at"])}
+    elif record_type is SatellitesSummary:
+        fields = {**fields, "online_scores": tuple(fields["online_scores"])}
+    if record_type in (SatellitesSummary, SatelliteScores):
+        # Snapshots of older versions have no daily series
+        fields = {
+            **fields,
+            "storage_daily": _load_series(fields.get("storage_daily")),
+            "egress_daily": _load_series(fields.get("egress_daily")),
+            "ingress_daily": _load_series(fields.get("ingress_daily")),
+        }
+    return record_type(**fields)
+
+
+def dump_records(data: dict[str, Any]) -> dict[str, Any]:
+    """Return the records of the coordinator data as JSON compatible data."""
+    dumped: dict[str, Any] = {}
+    for key, value in data.items():
+        if key == "metrics":
+            dumped[key] = dict(value)
+        elif key == "satellite":
+            dumped[key] = {
+                satellite_id: _dump_record(record)
+                for satellite_id, record in value.items()
+            }
+        elif key == "paystubs":
+            dumped[key] = [_dump_record(record) for record in value]
+        else:
+            dumped[key] = _dump_record(value)
+    return dumped
+
+
+def load_records(dumped: dict[str, Any]) -> dict[str, Any]:
+    """Return coordinator data from data returned by dump_records."""
+    data: dict[str, Any] = {}
+    for key, value in dumped.items():
+        if key == "metrics":
+            data[key] = dict(value)
+            continue
+        record_type = RECORD_TYPES[key]
+        if key == "satellite":
+            data[key] = {
+                satellite_id: _load_record(record_type, fields)
+                for satellite_id, fields in value.items()
+            }
+        elif key == "paystubs":
+            data[key] = [_load_record(record_type, fields) for fields in value]
+        else:
+            data[key] = _load_record(record_type, value)
+    return data
@@ -0,0 +1,92 @@
+"""Streaming parser of the Prometheus text format of the node debug endpoint."""
+
+from __future__ import annotations
+
+import math
+import re
+
+# The node exports every series as a gauge, counters are told by their name
+COUNTER_SUFFIXES = ("_count", "_total")
+
+# One label pair, the value may contain escaped quotes
+_LABEL = re.compile(r'\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*"((?:[^"\\]|\\.)*)"\s*,?')
+
+
+def _parse_labels(text: str) -> dict[str, str]:
+    """Return the labels of a label set without its braces."""
+    return {
+        match.group(1): match.group(2).replace('\\"', '"').replace("\\\\", "\\")
+        for match in _LABEL.finditer(text)
+    }
+
+
+def _split_series(series: str) -> tuple[str, dict[str, str]]:
+    """Return the name and labels of "name" or "name{label="value",...}"."""
+    name, brace, labels = series.strip().partition("{")
+    return name.strip(), _parse_labels(labels.rstrip("}")) if brace else {}
+
+
+def is_counter(selector: str) -> bool:
+    """Return whether a selector is of a counter, only growing until a restart."""
+    return _split_series(selector)[0].endswith(COUNTER_SUFFIXES)
+
+
+class MetricsFilter:
+    """
+    Sum the samples matching an allowlist of series selectors.
+
+    A selector is a metric name, optionally with labels the samples must have,
+    such as 'upload_success_count{field="total"}'. Lines are fed one at a
+    time and those of other metrics are dropped after reading their name, so
+    the output of the endpoint is never held in memory.
+    """
+
+    def __init__(self, selectors: list[str]) -> None:
+        """Initialize."""
+        self.selectors = selectors
+        self._by_name: dict[str, list[tuple[str, dict[str, str]]]] = {}
+        for selector in selectors:
+            name, labels = _split_series(selector)
+            self._by_name.setdefault(name, []).append((selector, labels))
+
+    def parser(self) -> MetricsParser:
+        """Return a parser collecting the values of one metrics output."""
+        return MetricsParser(self._by_name)
+
+
+class MetricsParser:
+    """Values of the selectors of a MetricsFilter in one metrics output."""
+
+    def __init__(self, by_name: dict[str, list[tuple[str, dict[str, str]]]]) -> None:
+        """Initialize."""
+        self._by_name = by_name
+        self.values: dict[str, float] = {}
+
+    def feed(self, line: bytes) -> None:
+        """Add the sample of one line if it matches a selector."""
+        # Cut the name out of the raw bytes first, as most lines are dropped
+        if not line or line[:1] == b"#":
+            return
+        end = len(line)
+        for separator in (b"{", b" "):
+            index = line.find(separator)
+            if index != -1 and index < end:
+                end = index
+        if (selectors := self._by_name.get(line[:end].decode())) is None:
+            return
+
+        text = line.decode().strip()
+        if text[end : end + 1] == "{":
+            close = text.rindex("}")
+            labels = _parse_labels(text[end + 1 : close])
+            rest = text[close + 1 :]
+        else:
+            labels = {}
+            rest = text[end:]
+        # The value may be followed by a timestamp
+        value = float(rest.split()[0])
+        if math.isnan(value):
+            return
+        for selector, wanted in selectors:
+            if all(labels.get(key) == label for key, label in wanted.items()):
+                self.values[selector] = self.values.get(selector, 0.0) + value
@@ -0,0 +1,176 @@
+"""Snapshots of nodes pushed by a collector to the webhook of an entry."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+from aiohttp.hdrs import METH_POST
+from homeassistant.components import webhook
+from homeassistant.core import callback
+
+from .api import json_loads
+from .const import CONF_PUSH, CONF_WEBHOOK_ID, DOMAIN, LOGGER
+from .models import check_record, dump_records, load_records
+
+if TYPE_CHECKING:
+    from aiohttp.web import Request
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import BlueprintDataUpdateCoordinator
+    from .data import IntegrationBlueprintConfigEntry
+
+SNAPSHOT_FORMAT = 1
+
+
+def build_snapshot(
+    coordinators: list[BlueprintDataUpdateCoordinator],
+) -> dict[str, Any]:
+    """
+    Return the last refresh of every node as one snapshot.
+
+    A node whose refresh failed is sent with the error instead of its data,
+    so Home Assistant shows it unavailable as if it polled it itself. The
+    finished paystub total travels along, as the paystubs of finished
+    periods are only cached by the collector.
+    """
+    nodes: dict[str, Any] = {}
+    for coordinator in coordinators:
+        if coordinator.last_update_success and coordinator.data is not None:
+            nodes[coordinator.client.target] = {
+                "data": dump_records(coordinator.data),
+                "finished_paid": coordinator.history.finished_paid,
+                "satellites_fetched": coordinator.fetched_at("satellites"),
+            }
+        else:
+            nodes[coordinator.client.target] = {
+                "error": str(coordinator.last_exception or "No data yet")
+            }
+    return {"format": SNAPSHOT_FORMAT, "sent": time.time(), "nodes": nodes}
+
+
+@dataclass(frozen=True, slots=True)
+class PushedNode:
+    """A node of a pushed snapshot, its data or the error its refresh failed with."""
+
+    data: dict[str, Any] | None = None
+    error: str | None = None
+    finished_paid: float = 0.0
+    # Wall clock time of the collector the satellites summary was fetched at
+    satellites_fetched: float | None = None
+
+
+def load_node(node: Any) -> PushedNode:
+    """
+    Return a node of a snapshot built by build_snapshot.
+
+    Raises AttributeError, KeyError, OverflowError, TypeError or ValueError
+    if it is malformed, also if a field of its records has the wrong type.
+    """
+    if not isinstance(node, dict):
+        msg = f"node is {type(node).__name__}, not an object"
+        raise TypeError(msg)
+    if "error" in node:
+        return PushedNode(error=str(node["error"]))
+    data = load_records(node["data"])
+    # Every sensor is derived from the node status
+    if "sno" not in data:
+        msg = "sno"
+        raise KeyError(msg)
+    for key, value in data.items():
+        if key == "metrics":
+            if not all(
+                isinstance(metric, int | float) and not isinstance(metric, bool)
+                for metric in value.values()
+            ):
+                msg = f"metrics are {value!r}"
+                raise TypeError(msg)
+            continue
+        if key == "satellite":
+            records = list(value.values())
+        elif key == "paystubs":
+            records = value
+        else:
+            records = [value]
+        for record in records:
+            check_record(record)
+    fetched = node.get("satellites_fetched")
+    return PushedNode(
+        data=data,
+        finished_paid=float(node.get("finished_paid", 0)),
+        satellites_fetched=None if fetched is None else float(fetched),
+    )
+
+
+def encode_snapshot(snapshot: dict[str, Any]) -> bytes:
+    """Return a snapshot as gzip compressed, compact JSON."""
+    return gzip.compress(json.dumps(snapshot, separators=(",", ":")).encode())
+
+
+@callback
+def async_register_webhook(
+    hass: HomeAssistant, entry: IntegrationBlueprintConfigEntry
+) -> None:
+    """Accept the snapshots of the pushed nodes of an entry until it unloads."""
+    webhook_id = entry.data[CONF_WEBHOOK_ID]
+    pushed = set(entry.options.get(CONF_PUSH, []))
+
+    async def _async_handle_webhook(
+        hass: HomeAssistant, webhook_id: str, request: Request
+    ) -> web.Response:
+        """Apply the nodes of a pushed snapshot to their coordinators."""
+        try:
+            # aiohttp decompresses bodies sent with Content-Encoding: gzip
+            snapshot = json_loads(await request.read())
+            if snapshot["format"] != SNAPSHOT_FORMAT:
+                msg = f"unknown format {snapshot['format']!r}"
+                raise ValueError(msg)
+            sent = float(snapshot["sent"])
+            # Every node is parsed before any is taken, so a malformed
+            # snapshot changes nothing and its corrected retry is taken
+            nodes = {
+                target: load_node(node)
+                for target, node in snapshot["nodes"].items()
+                if target in pushed
+            }
+        except (
+            AttributeError,
+            KeyError,
+            OverflowError,
+            TypeError,
+            ValueError,
+        ) as exception:
+            LOGGER.warning(
+                "Ignoring invalid snapshot pushed to %s: %r", entry.title, exception
+            )
+            return web.Response(status=HTTPStatus.BAD_REQUEST)
+        accepted = [
+            coordinator.client.target
+            for coordinator in entry.runtime_data.coordinators
+            if coordinator.client.target in nodes
+            and coordinator.async_set_pushed_data(
+                nodes[coordinator.client.target], sent
+            )
+        ]
+        if ignored := snapshot["nodes"].keys() - pushed:
+            LOGGER.debug(
+                "Ignoring pushed nodes %s, they are not pushed nodes of %s",
+                sorted(ignored),
+                entry.title,
+            )
+        return web.json_response({"accepted": accepted})
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        entry.title,
+        webhook_id,
+        _async_handle_webhook,
+        allowed_methods=[METH_POST],
+    )
+    entry.async_on_unload(lambda: webhook.async_unregister(hass, webhook_id))
@@ -0,0 +1,123 @@
+"""Throughput of a node from a ring buffer of its recent counter samples."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from typing import TYPE_CHECKING, Any
+
+from .derive import BYTES_PER_GB
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# Samples of the node status are taken every coordinator update, at the
+# default tick of ten minutes
+DEFAULT_TICK = 10 * 60
+# Rates are taken over a window spanning at least one satellites refresh, so
+# the month totals it reports have moved at least once, the averages and the
+# disk fill rate over an hour. A window is at least one tick long
+RATE_WINDOW = 15 * 60
+AVERAGE_WINDOW = 60 * 60
+BYTES_PER_MEGABIT = 125000
+SECONDS_PER_DAY = 86400
+
+# Columns of the satellites ring, month-to-date counters that reset at month
+# rollover, sampled only when a new satellites summary was fetched
+INGRESS = 0
+EGRESS = 1
+# Columns of the status ring, the month-to-date bandwidth and the disk used,
+# which may also shrink
+BANDWIDTH = 0
+DISK_USED = 1
+COLUMNS = 2
+
+
+class CounterRing:
+    """Fixed-size ring of counter samples kept in flat arrays."""
+
+    def __init__(self, tick: float = DEFAULT_TICK) -> None:
+        """Initialize, holding the samples of an average window at a tick."""
+        # Benchmarks refresh back to back, sampled as if at the default tick
+        self.tick = tick if tick > 0 else DEFAULT_TICK
+        self._capacity = math.ceil(max(AVERAGE_WINDOW, self.tick) / self.tick) + 1
+        self._times = array("d", [0.0] * self._capacity)
+        self._values = array("d", [math.nan] * (self._capacity * COLUMNS))
+        self._next = 0
+        self._count = 0
+
+    def add(self, timestamp: float, values: tuple[float | None, ...]) -> None:
+        """Add a sample, overwriting the oldest once the ring is full."""
+        self._times[self._next] = timestamp
+        offset = self._next * COLUMNS
+        for column, value in enumerate(values):
+            self._values[offset + column] = math.nan if value is None else value
+        self._next = (self._next + 1) % self._capacity
+        self._count = min(self._count + 1, self._capacity)
+
+    def _indexes(self, since: float) -> Iterator[int]:
+        """Yield the slots of the samples taken since a time, oldest first."""
+        for age in range(self._count, 0, -1):
+            index = (self._next - age) % self._capacity
+            if self._times[index] >= since:
+                yield index
+
+    def rate(self, column: int, window: float, *, counter: bool) -> float | None:
+        """
+        Return the change per second of a column over the last window seconds.
+
+        A window shorter than a tick spans one tick instead. A counter that
+        decreased was reset at month rollover, so its new value is what it
+        counted since then.
+        """
+        if not self._count:
+            return None
+        last = (self._next - 1) % self._capacity
+        # Half a tick of slack for the drift of the update timer
+        since = self._times[last] - max(window, self.tick) - self.tick / 2
+        first: int | None = None
+        previous = math.nan
+        change = 0.0
+        for index in self._indexes(since):
+            value = self._values[index * COLUMNS + column]
+            if math.isnan(value):
+                continue
+            if first is None:
+                first = index
+            elif counter and value < previous:
+                change += value
+            else:
+                change += value - previous
+            previous = value
+        if first is None:
+            return None
+        elapsed = self._times[last] - self._times[first]
+        return change / elapsed if elapsed > 0 else None
+
+
+def _megabits(rate: float | None) -> float | None:
+    """Return bytes per second as rounded megabits per second."""
+    if rate is None:
+        return None
+    return round(rate / BYTES_PER_MEGABIT, 3)
+
+
+def rate_values(status: CounterRing, satellites: CounterRing) -> dict[str, Any]:
+    """Return the throughput sensor values, keyed by sensor key."""
+    values: dict[str, Any] = {}
+    for key, ring, column in (
+        ("storj_ingress_rate", satellites, INGRESS),
+        ("storj_egress_rate", satellites, EGRESS),
+        ("storj_bandwidth_rate", status, BANDWIDTH),
+    ):
+        values[key] = _megabits(ring.rate(column, RATE_WINDOW, counter=True))
+        values[f"{key}_average"] = _megabits(
+            ring.rate(column, AVERAGE_WINDOW, counter=True)
+        )
+    fill_rate = status.rate(DISK_USED, AVERAGE_WINDOW, counter=False)
+    values["storj_disk_fill_rate"] = (
+        None
+        if fill_rate is None
+        else round(fill_rate * SECONDS_PER_DAY / BYTES_PER_GB, 2)
+    )
+    return values
@@ -0,0 +1,179 @@
+"""Threshold and transition rules checked against the changed sensor values."""
+
+from __future__ import annotations
+
+import operator
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, TypedDict
+
+from homeassistant.util.event_type import EventType
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Container
+
+
+class ThresholdEventData(TypedDict):
+    """Data of an event fired when a value crosses a threshold."""
+
+    node: str
+    key: str
+    rule: str
+    value: float | None
+    previous: float | None
+    # Whether the value is now beyond the threshold
+    active: bool
+
+
+class TransitionEventData(TypedDict):
+    """Data of an event fired when a watched value changed."""
+
+    node: str
+    key: str
+    rule: str
+    value: Any
+    previous: Any
+
+
+EVENT_THRESHOLD: EventType[ThresholdEventData] = EventType(f"{DOMAIN}_threshold")
+EVENT_TRANSITION: EventType[TransitionEventData] = EventType(f"{DOMAIN}_transition")
+
+OPERATORS: dict[str, Callable[[float, float], bool]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+CHANGED = "changed"
+# "<key> <operator> <number>" or "<key> changed"
+_RULE = re.compile(
+    r"^\s*(?P<key>[a-z0-9_]+)\s+"
+    r"(?:(?P<operator>>=|<=|>|<)\s*(?P<threshold>-?\d+(?:\.\d+)?)|(?P<changed>changed))"
+    r"\s*$"
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    """A threshold of a value, or a value whose changes are watched."""
+
+    text: str
+    key: str
+    operator: str = CHANGED
+    threshold: float = 0.0
+
+    def is_active(self, value: Any) -> bool:
+        """Return whether a value is beyond the threshold of the rule."""
+        return isinstance(value, int | float) and OPERATORS[self.operator](
+            value, self.threshold
+        )
+
+
+def parse_rule(text: str) -> Rule:
+    """Parse a rule such as "storj_disk_use_percentage > 95"."""
+    if (match := _RULE.match(text)) is None:
+        raise ValueError(text)
+    if match["changed"]:
+        return Rule(text=text.strip(), key=match["key"])
+    return Rule(
+        text=text.strip(),
+        key=match["key"],
+        operator=match["operator"],
+        threshold=float(match["threshold"]),
+    )
+
+
+class RuleEngine:
+    """
+    Rules of one node, indexed by the value keys they apply to.
+
+    Only the values that changed in an update are looked up, so the cost of
+    an update follows what changed rather than the number of rules. A rule
+    of a satellite sensor key applies to that sensor of every satellite.
+    """
+
+    def __init__(self, node: str, rules: list[Rule]) -> None:
+        """Initialize."""
+        self._node = node
+        self._rules: dict[str, list[Rule]] = {}
+        for rule in rules:
+            self._rules.setdefault(rule.key, []).append(rule)
+        # Rules of each value key seen, also the keys without any
+        self._index: dict[str, list[Rule]] = {}
+        self._values: dict[str, Any] = {}
+
+    @property
+    def keys(self) -> set[str]:
+        """Return the value keys of the rules, satellite sensor keys unexpanded."""
+        return set(self._rules)
+
+    def _rules_of(self, key: str, satellite_ids: Container[str]) -> list[Rule]:
+        """Return the rules applying to a value key."""
+        if (rules := self._index.get(key)) is None:
+            rules = self._index[key] = [
+                rule
+                for rule_key, key_rules in self._rules.items()
+                if key == rule_key
+                or (
+                    key.startswith(f"{rule_key}_")
+                    and key[len(rule_key) + 1 :] in satellite_ids
+                )
+                for rule in key_rules
+            ]
+        return rules
+
+    def check(
+        self,
+        values: dict[str, Any],
+        changed_keys: set[str],
+        satellite_ids: Container[str] = (),
+    ) -> list[tuple[EventType[Any], dict[str, Any]]]:
+        """
+        Return the events of the values that changed since the last check.
+
+        The first value of a key is only remembered, so restarts or restored
+        data do not fire events for conditions that already held.
+        """
+        events: list[tuple[EventType[Any], dict[str, Any]]] = []
+        if not self._rules:
+            return events
+        for key in changed_keys:
+            if not (rules := self._rules_of(key, satellite_ids)):
+                continue
+            value = values.get(key)
+            seen = key in self._values
+            previous = self._values.get(key)
+            self._values[key] = value
+            if not seen:
+                continue
+            for rule in rules:
+                if rule.operator == CHANGED:
+                    events.append(
+                        (
+                            EVENT_TRANSITION,
+                            TransitionEventData(
+                                node=self._node,
+                                key=key,
+                                rule=rule.text,
+                                value=value,
+                                previous=previous,
+                            ),
+                        )
+                    )
+                elif (active := rule.is_active(value)) != rule.is_active(previous):
+                    events.append(
+                        (
+                            EVENT_THRESHOLD,
+                            ThresholdEventData(
+                                node=self._node,
+                                key=key,
+                                rule=rule.text,
+                                value=value,
+                                previous=previous,
+                                active=active,
+                            ),
+                        )
+                    )
+        return events
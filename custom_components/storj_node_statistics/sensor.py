@@ -2,13 +2,25 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory, UnitOfDataRate, UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo
 
+from .const import ATTRIBUTION, CONF_NODES, ENDPOINTS
+from .derive import metric_value_key, satellite_value_key
 from .entity import IntegrationBlueprintEntity
+from .fleet import MAX, MIN, SUM, FleetAggregator
+from .prometheus import is_counter
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -17,125 +29,331 @@ if TYPE_CHECKING:
     from .coordinator import BlueprintDataUpdateCoordinator
     from .data import IntegrationBlueprintConfigEntry
 
+
+@dataclass(frozen=True, kw_only=True)
+class StorjSensorEntityDescription(SensorEntityDescription):
+    """Sensor description with the endpoints the value is derived from."""
+
+    # Only endpoints needed by an enabled sensor are fetched
+    endpoints: tuple[str, ...] = ()
+    # State attributes, each the value of the sensor key suffixed with its name
+    attributes: tuple[str, ...] = ()
+
+
 # Define all sensors here
-ENTITY_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = (
-    SensorEntityDescription(
+ENTITY_DESCRIPTIONS: tuple[StorjSensorEntityDescription, ...] = (
+    StorjSensorEntityDescription(
         key="storj_diskspace_available",
+        endpoints=("sno",),
         name="Diskspace Total",
         native_unit_of_measurement="GB",
         icon="mdi:harddisk",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_diskspace_used",
+        endpoints=("sno",),
         name="Diskspace Used",
         native_unit_of_measurement="GB",
         icon="mdi:harddisk",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_diskspace_trash",
+        endpoints=("sno",),
         name="Diskspace Trash",
         native_unit_of_measurement="GB",
         icon="mdi:harddisk",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_diskspace_free",
+        endpoints=("sno",),
         name="Diskspace Free",
         native_unit_of_measurement="GB",
         icon="mdi:harddisk",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_average_usage_bytes",
+        endpoints=("satellites",),
         name="Average Disk Space Used This Month",
         native_unit_of_measurement="GB",
         icon="mdi:harddisk",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_disk_use_percentage",
+        endpoints=("sno",),
         name="Disk Use Percentage",
         native_unit_of_measurement="%",
         icon="mdi:harddisk",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_nodeid",
+        endpoints=("sno",),
         name="Node ID",
         icon="mdi:identifier",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_wallet",
+        endpoints=("sno",),
         name="Wallet",
         icon="mdi:wallet",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_quic",
+        endpoints=("sno",),
         name="QUIC",
         icon="mdi:eye",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_uptime",
+        endpoints=("sno",),
         name="Uptime",
         icon="mdi:eye",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_version",
+        endpoints=("sno",),
         name="Version",
         icon="mdi:eye",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_bandwidth_used",
+        endpoints=("sno",),
         name="Bandwidth used this month",
         native_unit_of_measurement="GB",
         icon="mdi:chart-line",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_bandwidth_egress",
+        endpoints=("satellites",),
         name="Bandwidth Egress this month",
         native_unit_of_measurement="GB",
         icon="mdi:chart-line",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_bandwidth_ingress",
+        endpoints=("satellites",),
         name="Bandwidth Ingress this month",
         native_unit_of_measurement="GB",
         icon="mdi:chart-line",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_current_month_payout",
+        endpoints=("estimated-payout",),
         name="Estimated earning this month",
         native_unit_of_measurement="$",
         icon="mdi:currency-usd",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_current_month_held",
+        endpoints=("estimated-payout",),
         name="Held back this month",
         native_unit_of_measurement="$",
         icon="mdi:currency-usd",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_current_month_pay_total",
+        endpoints=("estimated-payout",),
         name="Gross total this month",
         native_unit_of_measurement="$",
         icon="mdi:currency-usd",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_satellite_avg_online",
+        endpoints=("satellites",),
         name="Average Online score of all satellites",
         native_unit_of_measurement="%",
         icon="mdi:percent",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_total_held",
+        endpoints=("held_history",),
         name="Total held amount",
         native_unit_of_measurement="$",
         icon="mdi:currency-usd",
     ),
-    SensorEntityDescription(
+    StorjSensorEntityDescription(
         key="storj_total_earned",
+        endpoints=("paystubs",),
         name="Total earned amount",
         native_unit_of_measurement="$",
         icon="mdi:currency-usd",
     ),
+    StorjSensorEntityDescription(
+        key="storj_ingress_rate",
+        endpoints=("satellites",),
+        name="Ingress rate",
+        native_unit_of_measurement=UnitOfDataRate.MEGABITS_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:download-network",
+    ),
+    StorjSensorEntityDescription(
+        key="storj_ingress_rate_average",
+        endpoints=("satellites",),
+        name="Ingress rate hourly average",
+        native_unit_of_measurement=UnitOfDataRate.MEGABITS_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:download-network",
+    ),
+    StorjSensorEntityDescription(
+        key="storj_egress_rate",
+        endpoints=("satellites",),
+        name="Egress rate",
+        native_unit_of_measurement=UnitOfDataRate.MEGABITS_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:upload-network",
+    ),
+    StorjSensorEntityDescription(
+        key="storj_egress_rate_average",
+        endpoints=("satellites",),
+        name="Egress rate hourly average",
+        native_unit_of_measurement=UnitOfDataRate.MEGABITS_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:upload-network",
+    ),
+    StorjSensorEntityDescription(
+        key="storj_bandwidth_rate",
+        endpoints=("sno",),
+        name="Bandwidth rate",
+        native_unit_of_measurement=UnitOfDataRate.MEGABITS_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:swap-vertical",
+    ),
+    StorjSensorEntityDescription(
+        key="storj_bandwidth_rate_average",
+        endpoints=("sno",),
+        name="Bandwidth rate hourly average",
+        native_unit_of_measurement=UnitOfDataRate.MEGABITS_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:swap-vertical",
+    ),
+    StorjSensorEntityDescription(
+        key="storj_disk_fill_rate",
+        endpoints=("sno",),
+        name="Disk fill rate",
+        native_unit_of_measurement="GB/d",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:harddisk-plus",
+    ),
+    StorjSensorEntityDescription(
+        key="storj_payout_forecast",
+        endpoints=("satellites", "estimated-payout"),
+        attributes=("lower", "upper"),
+        name="Forecast earning this month",
+        native_unit_of_measurement="$",
+        icon="mdi:cash-clock",
+    ),
+    StorjSensorEntityDescription(
+        key="storj_disk_full",
+        endpoints=("sno", "satellites"),
+        attributes=("earliest", "latest", "growth"),
+        name="Disk full forecast",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        icon="mdi:harddisk-remove",
+    ),
 )
 
+# Created for every satellite the node is part of
+SATELLITE_ENTITY_DESCRIPTIONS: tuple[StorjSensorEntityDescription, ...] = (
+    StorjSensorEntityDescription(
+        key="storj_satellite_audit",
+        endpoints=("satellite",),
+        name="Audit score",
+        native_unit_of_measurement="%",
+        icon="mdi:percent",
+    ),
+    StorjSensorEntityDescription(
+        key="storj_satellite_suspension",
+        endpoints=("satellite",),
+        name="Suspension score",
+        native_unit_of_measurement="%",
+        icon="mdi:percent",
+    ),
+    StorjSensorEntityDescription(
+        key="storj_satellite_online",
+        endpoints=("satellite",),
+        name="Online score",
+        native_unit_of_measurement="%",
+        icon="mdi:percent",
+    ),
+)
+
+SKIPPED_WRITES_DESCRIPTION = StorjSensorEntityDescription(
+    key="storj_skipped_writes",
+    name="Skipped state writes",
+    icon="mdi:content-save-off",
+    state_class=SensorStateClass.TOTAL_INCREASING,
+    entity_category=EntityCategory.DIAGNOSTIC,
+)
+
+
+def _fleet_description(
+    source_key: str, aggregate: str, name: str
+) -> StorjSensorEntityDescription:
+    """Return the description of an aggregate of a node sensor over a fleet."""
+    source = next(
+        description
+        for description in ENTITY_DESCRIPTIONS
+        if description.key == source_key
+    )
+    suffix = "" if aggregate == SUM else f"_{aggregate}"
+    return replace(source, key=f"storj_fleet_{source_key[6:]}{suffix}", name=name)
+
+
+# Created for fleet entries: the node sensor aggregated, how and the name
+_FLEET_SENSORS: tuple[tuple[str, str, str], ...] = (
+    ("storj_diskspace_available", SUM, "Fleet Diskspace Total"),
+    ("storj_diskspace_used", SUM, "Fleet Diskspace Used"),
+    ("storj_diskspace_free", SUM, "Fleet Diskspace Free"),
+    ("storj_diskspace_free", MIN, "Fleet Diskspace Free least"),
+    ("storj_disk_use_percentage", MAX, "Fleet Disk Use Percentage highest"),
+    ("storj_bandwidth_used", SUM, "Fleet Bandwidth used this month"),
+    ("storj_bandwidth_egress", SUM, "Fleet Bandwidth Egress this month"),
+    ("storj_bandwidth_ingress", SUM, "Fleet Bandwidth Ingress this month"),
+    ("storj_ingress_rate", SUM, "Fleet Ingress rate"),
+    ("storj_egress_rate", SUM, "Fleet Egress rate"),
+    ("storj_current_month_payout", SUM, "Fleet Estimated earning this month"),
+    ("storj_current_month_pay_total", SUM, "Fleet Gross total this month"),
+    ("storj_satellite_avg_online", MIN, "Fleet Online score lowest"),
+    ("storj_satellite_avg_online", MAX, "Fleet Online score highest"),
+)
+FLEET_ENTITY_DESCRIPTIONS: tuple[StorjSensorEntityDescription, ...] = tuple(
+    _fleet_description(source_key, aggregate, name)
+    for source_key, aggregate, name in _FLEET_SENSORS
+)
+# Aggregate key to the node value and aggregate it takes
+FLEET_AGGREGATES: dict[str, tuple[str, str]] = {
+    description.key: (source_key, aggregate)
+    for description, (source_key, aggregate, _) in zip(
+        FLEET_ENTITY_DESCRIPTIONS, _FLEET_SENSORS, strict=True
+    )
+}
+
+FLEET_REPORTING_DESCRIPTION = StorjSensorEntityDescription(
+    key="storj_fleet_nodes_reporting",
+    name="Fleet Nodes reporting",
+    icon="mdi:server-network",
+    state_class=SensorStateClass.MEASUREMENT,
+)
+
+# Request metrics of every endpoint, disabled unless a node needs looking into
+ENDPOINT_LATENCY_DESCRIPTIONS: dict[str, StorjSensorEntityDescription] = {
+    endpoint: StorjSensorEntityDescription(
+        key=f"storj_latency_{endpoint.replace('-', '_')}",
+        name=f"{endpoint} latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    )
+    for endpoint in ENDPOINTS
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -143,29 +361,224 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
+    coordinators = entry.runtime_data.coordinators
+    for coordinator in coordinators:
+        # Rules fire on the values of disabled sensors too, so their endpoints
+        # are fetched regardless
+        if endpoints := _rule_endpoints(coordinator):
+            entry.async_on_unload(coordinator.async_add_endpoint_user(endpoints))
+        if coordinator.data is not None:
+            _async_add_node(hass, entry, coordinator, async_add_entities)
+        else:
+            _async_add_on_first_data(hass, entry, coordinator, async_add_entities)
+
+    if CONF_NODES in entry.data:
+        aggregator = FleetAggregator(coordinators, FLEET_AGGREGATES)
+        entry.async_on_unload(aggregator.async_start())
+        async_add_entities(
+            [
+                *(
+                    StorjFleetSensor(
+                        entry=entry,
+                        aggregator=aggregator,
+                        entity_description=entity_description,
+                    )
+                    for entity_description in FLEET_ENTITY_DESCRIPTIONS
+                ),
+                StorjFleetReportingSensor(
+                    entry=entry,
+                    aggregator=aggregator,
+                    entity_description=FLEET_REPORTING_DESCRIPTION,
+                ),
+            ]
+        )
+
+
+def _rule_endpoints(coordinator: BlueprintDataUpdateCoordinator) -> tuple[str, ...]:
+    """Return the endpoints of the values the rules of a node check."""
+    descriptions = {
+        entity_description.key: entity_description
+        for entity_description in (
+            *ENTITY_DESCRIPTIONS,
+            *SATELLITE_ENTITY_DESCRIPTIONS,
+            *(
+                _metric_description(selector)
+                for selector in (
+                    coordinator.metrics_filter.selectors
+                    if coordinator.metrics_filter
+                    else ()
+                )
+            ),
+        )
+    }
+    return tuple(
+        sorted(
+            {
+                endpoint
+                for key in coordinator.rules.keys
+                if (entity_description := descriptions.get(key)) is not None
+                for endpoint in entity_description.endpoints
+            }
+        )
+    )
+
+
+@callback
+def _async_add_node(
+    hass: HomeAssistant,
+    entry: IntegrationBlueprintConfigEntry,
+    coordinator: BlueprintDataUpdateCoordinator,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Add the sensors of a node and follow the satellites it is part of."""
+    satellite_sensors: dict[str, list[StorjSatelliteSensor]] = {
+        satellite_id: _satellite_sensors(coordinator, satellite_id)
+        for satellite_id in coordinator.data["satellite"]
+    }
+
+    # The skipped writes sensor is added last so its coordinator listener runs
+    # after the other sensors have counted their skips for the update
     async_add_entities(
-        IntegrationBlueprintSensor(
-            coordinator=entry.runtime_data.coordinator,
+        [
+            *(
+                IntegrationBlueprintSensor(
+                    coordinator=coordinator,
+                    entity_description=entity_description,
+                )
+                for entity_description in ENTITY_DESCRIPTIONS
+            ),
+            *(sensor for sensors in satellite_sensors.values() for sensor in sensors),
+            *(
+                IntegrationBlueprintSensor(
+                    coordinator=coordinator,
+                    entity_description=_metric_description(selector),
+                )
+                for selector in (
+                    coordinator.metrics_filter.selectors
+                    if coordinator.metrics_filter
+                    else ()
+                )
+            ),
+            *(
+                StorjEndpointLatencySensor(
+                    coordinator=coordinator,
+                    entity_description=entity_description,
+                    endpoint=endpoint,
+                )
+                for endpoint, entity_description in ENDPOINT_LATENCY_DESCRIPTIONS.items()
+            ),
+            StorjSkippedWritesSensor(
+                coordinator=coordinator,
+                entity_description=SKIPPED_WRITES_DESCRIPTION,
+            ),
+        ]
+    )
+
+    @callback
+    def _async_update_satellites() -> None:
+        if coordinator.data is None:
+            return
+        current = coordinator.data["satellite"]
+        new_sensors = []
+        for satellite_id in current.keys() - satellite_sensors.keys():
+            satellite_sensors[satellite_id] = _satellite_sensors(
+                coordinator, satellite_id
+            )
+            new_sensors.extend(satellite_sensors[satellite_id])
+        if new_sensors:
+            async_add_entities(new_sensors)
+
+        entity_registry = er.async_get(hass)
+        for satellite_id in satellite_sensors.keys() - current.keys():
+            for sensor in satellite_sensors.pop(satellite_id):
+                if sensor.registry_entry is not None:
+                    entity_registry.async_remove(sensor.entity_id)
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_update_satellites))
+
+
+def _satellite_sensors(
+    coordinator: BlueprintDataUpdateCoordinator,
+    satellite_id: str,
+) -> list[StorjSatelliteSensor]:
+    """Return the sensors of one satellite of a node."""
+    return [
+        StorjSatelliteSensor(
+            coordinator=coordinator,
             entity_description=entity_description,
+            satellite_id=satellite_id,
         )
-        for entity_description in ENTITY_DESCRIPTIONS
+        for entity_description in SATELLITE_ENTITY_DESCRIPTIONS
+    ]
+
+
+def _metric_description(selector: str) -> StorjSensorEntityDescription:
+    """Return the description of the sensor of a debug metrics series."""
+    return StorjSensorEntityDescription(
+        key=metric_value_key(selector),
+        endpoints=("metrics",),
+        name=selector,
+        icon="mdi:chart-line",
+        # Counters start over when the node restarts, which long-term
+        # statistics only account for in increasing totals
+        state_class=(
+            SensorStateClass.TOTAL_INCREASING
+            if is_counter(selector)
+            else SensorStateClass.MEASUREMENT
+        ),
     )
 
 
+@callback
+def _async_add_on_first_data(
+    hass: HomeAssistant,
+    entry: IntegrationBlueprintConfigEntry,
+    coordinator: BlueprintDataUpdateCoordinator,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Add the sensors of a node once it returned data, as they need its ID."""
+    remove_listener: CALLBACK_TYPE | None = None
+
+    @callback
+    def _async_remove_listener() -> None:
+        nonlocal remove_listener
+        if remove_listener is not None:
+            remove_listener()
+            remove_listener = None
+
+    @callback
+    def _async_check_data() -> None:
+        if coordinator.data is None or remove_listener is None:
+            return
+        _async_remove_listener()
+        _async_add_node(hass, entry, coordinator, async_add_entities)
+
+    remove_listener = coordinator.async_add_listener(_async_check_data)
+    entry.async_on_unload(_async_remove_listener)
+
+
 class IntegrationBlueprintSensor(IntegrationBlueprintEntity, SensorEntity):
     """Integration Blueprint Sensor class."""
 
+    entity_description: StorjSensorEntityDescription
+
     def __init__(
         self,
         coordinator: BlueprintDataUpdateCoordinator,
-        entity_description: SensorEntityDescription,
+        entity_description: StorjSensorEntityDescription,
     ) -> None:
         super().__init__(coordinator)
         self.entity_description = entity_description
 
         # Get first 6 chars of nodeID, fallback to "unknown"
-        node_id = self.coordinator.data.get("sno", {}).get("nodeID", "unknown")
+        node_id = self.coordinator.data["sno"].node_id
         self._prefix = node_id[:6].lower() if node_id else "unknown"
+        self._value_key = entity_description.key
+        self._attribute_keys = {
+            name: f"{entity_description.key}_{name}"
+            for name in entity_description.attributes
+        }
+        self._written_available: bool | None = None
 
     @property
     def unique_id(self) -> str:
@@ -186,125 +599,198 @@ class IntegrationBlueprintSensor(IntegrationBlueprintEntity, SensorEntity):
         )
 
     @property
-    def native_value(self) -> str | None:
-        """Return the native value depending on the sensor type."""
-        disk_total = self.coordinator.data["sno"].get("diskSpace", {}).get("allocated")
-        disk_available = (
-            self.coordinator.data["sno"].get("diskSpace", {}).get("available")
+    def native_value(self) -> str | float | None:
+        """Return the value derived for this sensor in the last update."""
+        return self.coordinator.values.get(self._value_key)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the values derived for the attributes of this sensor."""
+        if not self._attribute_keys:
+            return None
+        return {
+            name: self.coordinator.values.get(key)
+            for name, key in self._attribute_keys.items()
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Have the coordinator fetch the endpoints of this sensor while enabled."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_endpoint_user(self.entity_description.endpoints)
         )
-        disk_used = self.coordinator.data["sno"].get("diskSpace", {}).get("used")
-        disk_trash = self.coordinator.data["sno"].get("diskSpace", {}).get("trash")
-        payout = (
-            self.coordinator.data["estimated-payout"]
-            .get("currentMonth", {})
-            .get("payout")
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the value or availability changed."""
+        changed_keys = self.coordinator.changed_keys
+        if (
+            self._value_key in changed_keys
+            or self.available != self._written_available
+            or any(key in changed_keys for key in self._attribute_keys.values())
+        ):
+            self.async_write_ha_state()
+        else:
+            self.coordinator.skipped_writes += 1
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember the availability it was written with."""
+        self._written_available = self.available
+        super().async_write_ha_state()
+
+
+class StorjSatelliteSensor(IntegrationBlueprintSensor):
+    """Sensor for one score of one satellite of a node."""
+
+    def __init__(
+        self,
+        coordinator: BlueprintDataUpdateCoordinator,
+        entity_description: StorjSensorEntityDescription,
+        satellite_id: str,
+    ) -> None:
+        super().__init__(coordinator, entity_description)
+        self._satellite_id = satellite_id
+        self._value_key = satellite_value_key(entity_description.key, satellite_id)
+        # Satellite URLs look like "us1.storj.io:7777"
+        url = coordinator.data["sno"].satellites.get(satellite_id, satellite_id)
+        self._satellite_name = url.split(":")[0]
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique ID for this sensor."""
+        return f"{self._prefix}_{self.entity_description.key}_{self._satellite_id}"
+
+    @property
+    def name(self) -> str:
+        """Return the name of this sensor."""
+        return f"{self._prefix} {self._satellite_name} {self.entity_description.name}"
+
+
+class StorjSkippedWritesSensor(IntegrationBlueprintSensor):
+    """Sensor counting the state writes skipped because nothing changed."""
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of skipped state writes."""
+        return self.coordinator.skipped_writes
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state on every update, as the count is not a derived value."""
+        self.async_write_ha_state()
+
+
+class StorjEndpointLatencySensor(IntegrationBlueprintSensor):
+    """Sensor for the request metrics of one endpoint of a node."""
+
+    def __init__(
+        self,
+        coordinator: BlueprintDataUpdateCoordinator,
+        entity_description: StorjSensorEntityDescription,
+        endpoint: str,
+    ) -> None:
+        super().__init__(coordinator, entity_description)
+        self._endpoint = endpoint
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the latency of the last successful request in milliseconds."""
+        metrics = self.coordinator.client.metrics.get(self._endpoint)
+        if metrics is None or metrics.last_latency is None:
+            return None
+        return round(metrics.last_latency * 1000, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the other request metrics of the endpoint."""
+        if (metrics := self.coordinator.client.metrics.get(self._endpoint)) is None:
+            return None
+        return metrics.as_dict()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state on every update, as the metrics are not derived values."""
+        self.async_write_ha_state()
+
+
+class StorjFleetSensor(SensorEntity):
+    """Sensor for an aggregate of a node value over the nodes of a fleet."""
+
+    _attr_attribution = ATTRIBUTION
+    _attr_should_poll = False
+    entity_description: StorjSensorEntityDescription
+
+    def __init__(
+        self,
+        entry: IntegrationBlueprintConfigEntry,
+        aggregator: FleetAggregator,
+        entity_description: StorjSensorEntityDescription,
+    ) -> None:
+        self.entity_description = entity_description
+        self._entry = entry
+        self._aggregator = aggregator
+        self._attr_unique_id = f"fleet_{entry.entry_id}_{entity_description.key}"
+        self._attr_name = entity_description.name
+        self._attr_device_info = DeviceInfo(
+            identifiers={("integration_blueprint", f"fleet_{entry.entry_id}")},
+            name=entry.title,
         )
-        held = (
-            self.coordinator.data["estimated-payout"]
-            .get("currentMonth", {})
-            .get("held")
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the aggregate, unknown while no node reports a value."""
+        return self._aggregator.values[self.entity_description.key]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the number of nodes the aggregate is taken over."""
+        return {"nodes": self._aggregator.contributors(self.entity_description.key)}
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the aggregates and have every node fetch their endpoints."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._aggregator.async_add_listener(self._handle_aggregator_update)
         )
-        # ---
-        if self.entity_description.key == "storj_diskspace_available":
-            return round(float(disk_total / 1000000000), 2)
-        # ---
-        if self.entity_description.key == "storj_diskspace_used":
-            return round(float(disk_used / 1000000000), 2)
-        # ---
-        if self.entity_description.key == "storj_diskspace_trash":
-            return round(float(disk_trash / 1000000000), 2)
-        # ---
-        if self.entity_description.key == "storj_diskspace_free":
-            disk_free = disk_available
-            return round(float(disk_free / 1000000000), 2)
-        # ---
-        if self.entity_description.key == "storj_average_usage_bytes":
-            average_usage_bytes_raw = self.coordinator.data["satellites"].get(
-                "averageUsageBytes"
-            )
-            if average_usage_bytes_raw is not None:
-                average_usage_bytes_gb = average_usage_bytes_raw / 1000000000
-                return round(float(average_usage_bytes_gb), 2)
-        # ---
-        if self.entity_description.key == "storj_disk_use_percentage":
-            disk_used_percent = ((disk_total - disk_available) / disk_total) * 100
-            return round(float(disk_used_percent), 2)
-        # ---
-        if self.entity_description.key == "storj_wallet":
-            return self.coordinator.data["sno"].get("wallet")
-        # ---
-        if self.entity_description.key == "storj_quic":
-            return self.coordinator.data["sno"].get("quicStatus")
-        # ---
-        if self.entity_description.key == "storj_uptime":
-            started_at_str = self.coordinator.data["sno"].get("startedAt")
-            started_at = datetime.fromisoformat(started_at_str.replace("Z", "+00:00"))
-            now = datetime.now(timezone.utc)
-            uptime = now - started_at
-            days = uptime.days
-            hours, remainder = divmod(uptime.seconds, 3600)
-            minutes, _ = divmod(remainder, 60)
-            return f"{days}d {hours}h {minutes}m"
-        # ---
-        if self.entity_description.key == "storj_version":
-            return self.coordinator.data["sno"].get("version")
-        # ---
-        if self.entity_description.key == "storj_bandwidth_used":
-            bandwidth_used_raw = (
-                self.coordinator.data["sno"].get("bandwidth", {}).get("used")
-            )
-            if bandwidth_used_raw is not None:
-                bandwidth_used_gb = bandwidth_used_raw / 1000000000
-                return round(float(bandwidth_used_gb), 2)
-        # ---
-        if self.entity_description.key == "storj_bandwidth_egress":
-            bandwidth_used_raw = self.coordinator.data["satellites"].get(
-                "egressSummary"
+        for coordinator in self._entry.runtime_data.coordinators:
+            self.async_on_remove(
+                coordinator.async_add_endpoint_user(self.entity_description.endpoints)
             )
-            if bandwidth_used_raw is not None:
-                bandwidth_used_gb = bandwidth_used_raw / 1000000000
-                return round(float(bandwidth_used_gb), 2)
-        # ---
-        if self.entity_description.key == "storj_bandwidth_ingress":
-            bandwidth_used_raw = self.coordinator.data["satellites"].get(
-                "ingressSummary"
-            )
-            if bandwidth_used_raw is not None:
-                bandwidth_used_gb = bandwidth_used_raw / 1000000000
-                return round(float(bandwidth_used_gb), 2)
-        # ---
-        if self.entity_description.key == "storj_nodeid":
-            # return "abc123notrealf7c84e9d50a3a9e6a4370f7f5c8a92e5e983ef"
-            return self.coordinator.data["sno"].get("nodeID")
-        # ---
-        if self.entity_description.key == "storj_current_month_payout":
-            return round(float(payout / 100), 2)
-        # ---
-        if self.entity_description.key == "storj_current_month_held":
-            return round(float(held / 100), 2)
-        # ---
-        if self.entity_description.key == "storj_current_month_pay_total":
-            pay_total = payout + held
-            return round(float(pay_total / 100), 2)
-        # ---
-        if self.entity_description.key == "storj_satellite_avg_online":
-            avg_online_score = 0.0
-            audits = self.coordinator.data["satellites"].get("audits", [])
-            avg_online_score = (
-                sum(a["onlineScore"] for a in audits) / len(audits) * 100
-                if audits
-                else 0
-            )
-            return round(float(avg_online_score), 2)
-        # ---
-        if self.entity_description.key == "storj_total_held":
-            data = self.coordinator.data["held_history"]
-            total_held = sum(item["totalHeld"] for item in data)
-            return round(float(total_held / 1000000), 2)
-        # ---
-        if self.entity_description.key == "storj_total_earned":
-            data = self.coordinator.data["paystubs"]
-            total_earned = sum(item["paid"] for item in data)
-            return round(float(total_earned / 1000000), 2)
-        # ---
-        return None
+
+    @callback
+    def _handle_aggregator_update(self) -> None:
+        """Write the state only when the aggregate or its node count changed."""
+        if self.entity_description.key in self._aggregator.changed_keys:
+            self.async_write_ha_state()
+
+
+class StorjFleetReportingSensor(StorjFleetSensor):
+    """Sensor counting the nodes of a fleet that are part of the aggregates."""
+
+    _written_unavailable: list[str] | None = None
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of nodes whose last refresh succeeded."""
+        return len(self._aggregator.reporting)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the nodes left out of the aggregates."""
+        return {
+            "nodes": len(self._entry.runtime_data.coordinators),
+            "unavailable_nodes": self._aggregator.unavailable,
+        }
+
+    @callback
+    def _handle_aggregator_update(self) -> None:
+        """Write the state when a node started or stopped reporting."""
+        if self._aggregator.unavailable != self._written_unavailable:
+            self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember the nodes it was written with."""
+        self._written_unavailable = self._aggregator.unavailable
+        super().async_write_ha_state()
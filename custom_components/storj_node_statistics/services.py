@@ -0,0 +1,88 @@
+"""Services of storj_node_statistics."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .api import CACHE_TTL, IntegrationBlueprintApiClientError
+from .const import DOMAIN, ENDPOINTS
+from .data import async_get_coordinator
+
+SERVICE_FETCH = "fetch"
+ATTR_NODE = "node"
+ATTR_ENDPOINTS = "endpoints"
+ATTR_FIELDS = "fields"
+ATTR_MAX_AGE = "max_age"
+
+FETCH_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_NODE): cv.string,
+        vol.Optional(ATTR_ENDPOINTS, default=["sno"]): vol.All(
+            cv.ensure_list, [vol.In(list(ENDPOINTS))]
+        ),
+        vol.Optional(ATTR_FIELDS, default=[]): vol.All(cv.ensure_list, [cv.string]),
+        # Responses of the last refresh are usually younger than the TTL, so
+        # by default the service does not query the node again
+        vol.Optional(ATTR_MAX_AGE, default=CACHE_TTL): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=CACHE_TTL)
+        ),
+    }
+)
+
+
+def _select(data: Any, path: list[str]) -> Any:
+    """Return the part of data at a path, "*" selects every key or item."""
+    if not path:
+        return data
+    segment, rest = path[0], path[1:]
+    if isinstance(data, dict):
+        if segment == "*":
+            return {key: _select(value, rest) for key, value in data.items()}
+        return _select(data[segment], rest) if segment in data else None
+    if isinstance(data, list):
+        if segment == "*":
+            return [_select(item, rest) for item in data]
+        if segment.isdigit() and int(segment) < len(data):
+            return _select(data[int(segment)], rest)
+    return None
+
+
+async def _async_fetch(call: ServiceCall) -> ServiceResponse:
+    """Return the JSON of endpoints of a node, or the selected fields of it."""
+    if (coordinator := async_get_coordinator(call.hass, call.data[ATTR_NODE])) is None:
+        msg = f"No configured node {call.data[ATTR_NODE]}"
+        raise ServiceValidationError(msg)
+    try:
+        data = await coordinator.async_fetch_json(
+            list(dict.fromkeys(call.data[ATTR_ENDPOINTS])), call.data[ATTR_MAX_AGE]
+        )
+    except IntegrationBlueprintApiClientError as exception:
+        raise HomeAssistantError(exception) from exception
+    if fields := call.data[ATTR_FIELDS]:
+        # Fields are dotted paths starting with the endpoint, such as
+        # sno.diskSpace.used or satellite.*.audits.onlineScore
+        data = {field: _select(data, field.split(".")) for field in fields}
+    return {"node": coordinator.client.target, "data": data}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FETCH,
+        _async_fetch,
+        schema=FETCH_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
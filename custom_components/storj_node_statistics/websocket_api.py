@@ -0,0 +1,129 @@
+"""WebSocket API serving the daily series of the nodes to dashboard cards."""
+
+from __future__ import annotations
+
+import bisect
+import math
+from datetime import UTC, date, datetime, time
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN
+from .data import async_get_coordinator
+
+if TYPE_CHECKING:
+    from .models import DailySeries
+
+# Series served, and whether a downsampled point sums its days or averages
+# them, bandwidth is a daily total while storage is a daily average
+SERIES: dict[str, bool] = {
+    "storage": False,
+    "egress": True,
+    "ingress": True,
+}
+MAX_POINTS = 366
+
+
+def _timestamp(day: date) -> int:
+    """Return the Unix timestamp of the start of a day in UTC."""
+    return int(datetime.combine(day, time.min, UTC).timestamp())
+
+
+def series_columns(
+    series: dict[str, DailySeries],
+    start: date | None = None,
+    end: date | None = None,
+    points: int | None = None,
+) -> dict[str, list[Any]]:
+    """
+    Return daily series as columns sharing one column of day starts.
+
+    Only days from start through end are included. With points, consecutive
+    days are merged into at most that many points starting at their first
+    day. Days a series has no value for are None in its column.
+    """
+    low = _timestamp(start) if start is not None else -math.inf
+    high = _timestamp(end) if end is not None else math.inf
+    by_start: dict[str, dict[int, float]] = {}
+    for name, daily in series.items():
+        # The days of a series are in order, so the range is found by bisection
+        first = bisect.bisect_left(daily.starts, low)
+        last = bisect.bisect_right(daily.starts, high)
+        by_start[name] = dict(
+            zip(daily.starts[first:last], daily.values[first:last], strict=True)
+        )
+    starts = sorted({day for values in by_start.values() for day in values})
+
+    size = math.ceil(len(starts) / points) if points and starts else 1
+    columns: dict[str, list[Any]] = {"start": starts[::size]}
+    for name, values in by_start.items():
+        column: list[float | None] = []
+        for index in range(0, len(starts), size):
+            merged = [
+                values[day] for day in starts[index : index + size] if day in values
+            ]
+            if not merged:
+                column.append(None)
+            elif size == 1 or SERIES[name]:
+                column.append(sum(merged))
+            else:
+                column.append(sum(merged) / len(merged))
+        columns[name] = column
+    return columns
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/daily_series",
+        vol.Required("node"): cv.string,
+        vol.Optional("satellite"): cv.string,
+        vol.Optional("series", default=list(SERIES)): vol.All(
+            cv.ensure_list, [vol.In(list(SERIES))]
+        ),
+        vol.Optional("start"): cv.date,
+        vol.Optional("end"): cv.date,
+        vol.Optional("points"): vol.All(int, vol.Range(min=1, max=MAX_POINTS)),
+    }
+)
+@callback
+def _ws_daily_series(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send the cached daily series of a node or of one of its satellites."""
+    coordinator = async_get_coordinator(hass, msg["node"])
+    data = coordinator.data if coordinator is not None else None
+    if data is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, f"No data of node {msg['node']}"
+        )
+        return
+    if "satellite" in msg:
+        record = data.get("satellite", {}).get(msg["satellite"])
+    else:
+        record = data.get("satellites")
+    if record is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "No daily series fetched yet"
+        )
+        return
+    connection.send_result(
+        msg["id"],
+        series_columns(
+            {name: getattr(record, f"{name}_daily") for name in msg["series"]},
+            msg.get("start"),
+            msg.get("end"),
+            msg.get("points"),
+        ),
+    )
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the WebSocket commands of the integration."""
+    websocket_api.async_register_command(hass, _ws_daily_series)
@@ -0,0 +1 @@
+"""Tests of storj_node_statistics."""
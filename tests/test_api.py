@@ -0,0 +1,129 @@
+"""Tests of the node API client."""
+
+import asyncio
+import time
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+
+from custom_components.storj_node_statistics.api import (
+    CACHE_TTL,
+    CircuitBreaker,
+    IntegrationBlueprintApiClient,
+)
+
+URL = "http://1.2.3.4:14002/api/sno/"
+
+
+def _schedule(breaker: CircuitBreaker, refreshes: int) -> str:
+    """Return F for each refresh that failed and s for each one skipped."""
+    schedule = ""
+    for _ in range(refreshes):
+        if breaker.is_open and breaker.retry_in():
+            breaker.skip()
+            schedule += "s"
+        else:
+            breaker.record_failure()
+            schedule += "F"
+    return schedule
+
+
+def test_breaker_backoff() -> None:
+    """Test that the breaker skips 1, 2, 4 refreshes after three failures."""
+    breaker = CircuitBreaker(base_delay=600)
+    assert _schedule(breaker, 2) == "FF"
+    assert not breaker.is_open
+    assert breaker.retry_in() == 0
+    assert _schedule(breaker, 1) == "F"
+    assert breaker.is_open
+    assert breaker.retry_in() == 600
+    assert _schedule(breaker, 11) == "sF" + "ssF" + "ssssF" + "s"
+
+
+def test_breaker_max_delay() -> None:
+    """Test that the backoff is capped at the maximum delay."""
+    breaker = CircuitBreaker(base_delay=600, max_delay=3600)
+    for _ in range(100):
+        breaker.record_failure()
+    assert breaker.retry_in() == 3600
+    breaker = CircuitBreaker(base_delay=7200, max_delay=3600)
+    _schedule(breaker, 3)
+    assert breaker.retry_in() == 7200
+
+
+def test_breaker_success() -> None:
+    """Test that a success closes the breaker."""
+    breaker = CircuitBreaker(base_delay=60, threshold=2)
+    _schedule(breaker, 2)
+    assert breaker.is_open
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.retry_in() == 0
+    assert _schedule(breaker, 3) == "FFs"
+
+
+@pytest.mark.parametrize("threshold", [1, 3, 5])
+def test_breaker_threshold(threshold: int) -> None:
+    """Test that the breaker opens at the threshold, not after it."""
+    breaker = CircuitBreaker(base_delay=60, threshold=threshold)
+    assert _schedule(breaker, threshold + 1) == "F" * threshold + "s"
+
+
+def _client(hass: HomeAssistant) -> IntegrationBlueprintApiClient:
+    """Return a client of a node."""
+    return IntegrationBlueprintApiClient(
+        "1.2.3.4", 14002, async_get_clientsession(hass)
+    )
+
+
+async def test_cache(hass: HomeAssistant, aioclient_mock: AiohttpClientMocker) -> None:
+    """Test that responses are shared and cached up to their max age."""
+    aioclient_mock.get(URL, json={"nodeID": "1"})
+    client = _client(hass)
+    # Concurrent callers share one request
+    results = await asyncio.gather(
+        *(client.async_get_data(endpoint="sno", max_age=0) for _ in range(3))
+    )
+    assert results == [{"nodeID": "1"}] * 3
+    assert aioclient_mock.call_count == 1
+    assert await client.async_get_data(max_age=CACHE_TTL) == {"nodeID": "1"}
+    assert aioclient_mock.call_count == 1
+    await client.async_get_data(max_age=0)
+    assert aioclient_mock.call_count == 2
+    assert client.metrics["sno"].as_dict()["requests"] == 1
+    client.close()
+
+
+async def test_cache_expiry(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test that expired responses are dropped without a new request."""
+    aioclient_mock.get(URL, json={"nodeID": "1"})
+    client = _client(hass)
+    await client.async_get_data()
+    assert client._expiry is not None
+    # Age the response past the TTL, as when its expiry fires
+    _, response = client._cache["/api/sno/"]
+    client._cache["/api/sno/"] = (time.monotonic() - CACHE_TTL, response)
+    client._evict()
+    assert not client._cache
+    assert client._expiry is None
+
+
+async def test_closed_client(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test that a released client caches nothing, not even late responses."""
+    aioclient_mock.get(URL, json={"nodeID": "1"})
+    client = _client(hass)
+    await client.async_get_data()
+    request = asyncio.ensure_future(client.async_get_data(max_age=0))
+    await asyncio.sleep(0)
+    client.close()
+    assert await request == {"nodeID": "1"}
+    assert not client._cache
+    assert client._expiry is None
@@ -0,0 +1,73 @@
+"""Tests of the payout history cache."""
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+
+from custom_components.storj_node_statistics.history import PayoutHistoryCache
+from custom_components.storj_node_statistics.models import Paystub
+
+PAYSTUBS_PATH = "/api/heldamount/paystubs"
+
+
+def _paystubs(*periods: str) -> list[Paystub]:
+    """Return a paystub of 100 of every satellite period."""
+    return [Paystub(period=period, paid=100) for period in periods]
+
+
+async def test_incremental_paystubs(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test that finished periods are requested once and counted once."""
+    freezer.move_to("2026-10-18")
+    cache = PayoutHistoryCache(hass, "node")
+    assert cache.paystubs_path() == f"{PAYSTUBS_PATH}/2000-1/2026-10"
+
+    # Periods through August are final, September and October can still change
+    paystubs = _paystubs("2026-07", "2026-08", "2026-08", "2026-09", "2026-10")
+    open_paystubs = cache.add_paystubs(paystubs)
+    assert [paystub.period for paystub in open_paystubs] == ["2026-09", "2026-10"]
+    assert cache.finished_paid == 300
+    assert cache.total_paid(open_paystubs) == 500
+    assert cache.paystubs_path() == f"{PAYSTUBS_PATH}/2026-9/2026-10"
+
+    # Fetching the open periods again in the same month adds nothing
+    open_paystubs = cache.add_paystubs(_paystubs("2026-09", "2026-10"))
+    assert cache.finished_paid == 300
+    assert cache.total_paid(open_paystubs) == 500
+
+    # September is final a month later
+    freezer.move_to("2026-11-02")
+    assert cache.paystubs_path() == f"{PAYSTUBS_PATH}/2026-9/2026-11"
+    open_paystubs = cache.add_paystubs(_paystubs("2026-09", "2026-10", "2026-11"))
+    assert cache.finished_paid == 400
+    assert cache.total_paid(open_paystubs) == 600
+    assert cache.paystubs_path() == f"{PAYSTUBS_PATH}/2026-10/2026-11"
+
+
+async def test_complete_path(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test that the complete range ignores what is cached."""
+    freezer.move_to("2026-10-18")
+    cache = PayoutHistoryCache(hass, "node")
+    cache.add_paystubs(_paystubs("2026-01"))
+    assert cache.paystubs_path() == f"{PAYSTUBS_PATH}/2026-9/2026-10"
+    assert cache.paystubs_path(complete=True) == f"{PAYSTUBS_PATH}/2000-1/2026-10"
+
+
+async def test_cache_persisted(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test that the finished periods are kept across restarts."""
+    freezer.move_to("2026-10-18")
+    cache = PayoutHistoryCache(hass, "node")
+    cache.add_paystubs(_paystubs("2026-07", "2026-08", "2026-10"))
+    await cache.async_save()
+
+    restored = PayoutHistoryCache(hass, "node")
+    await restored.async_load()
+    assert restored.finished_paid == 200
+    assert restored.paystubs_path() == cache.paystubs_path()
+    other = PayoutHistoryCache(hass, "other")
+    await other.async_load()
+    assert other.paystubs_path() == f"{PAYSTUBS_PATH}/2000-1/2026-10"
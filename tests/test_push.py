@@ -0,0 +1,108 @@
+"""Tests of the validation of pushed snapshots."""
+
+import json
+from typing import Any
+
+import pytest
+
+from benchmarks.payloads import node_payloads
+from custom_components.storj_node_statistics.models import (
+    PARSERS,
+    Paystub,
+    check_record,
+    dump_records,
+)
+from custom_components.storj_node_statistics.push import load_node
+
+
+def _node() -> dict[str, Any]:
+    """Return a node of a snapshot as a collector would push it."""
+    payloads = node_payloads(months=3)
+    data = {key: PARSERS[key](payloads[key]) for key in payloads if key != "satellite"}
+    data["satellite"] = {
+        satellite_id: PARSERS["satellite"](payload)
+        for satellite_id, payload in payloads["satellite"].items()
+    }
+    data["metrics"] = {"upload_success_count": 12.0}
+    node = {"data": dump_records(data), "finished_paid": 1200, "satellites_fetched": 1}
+    return json.loads(json.dumps(node))
+
+
+def test_load_node() -> None:
+    """Test loading a valid node."""
+    pushed = load_node(_node())
+    assert pushed.error is None
+    assert pushed.data is not None
+    assert set(pushed.data) >= {"sno", "satellites", "satellite", "paystubs"}
+    assert pushed.finished_paid == 1200.0
+    assert pushed.satellites_fetched == 1.0
+
+
+def test_load_error_node() -> None:
+    """Test loading a node the collector failed to refresh."""
+    pushed = load_node({"error": "timeout"})
+    assert pushed.error == "timeout"
+    assert pushed.data is None
+
+
+def _set(node: dict[str, Any], path: str, value: Any) -> None:
+    """Set a value at a dotted path, digits index lists."""
+    *parents, last = path.split(".")
+    for part in parents:
+        node = node[int(part)] if part.isdigit() else node[part]
+    if last.isdigit():
+        node[int(last)] = value
+    else:
+        node[last] = value
+
+
+@pytest.mark.parametrize(
+    ("path", "value", "error"),
+    [
+        ("data.sno.disk_used", "1000", TypeError),
+        ("data.sno.disk_used", True, TypeError),
+        ("data.sno.node_id", 1, TypeError),
+        ("data.sno.satellites", {"id": 1}, TypeError),
+        ("data.sno.satellites", [], TypeError),
+        ("data.sno.started_at", "yesterday", ValueError),
+        ("data.sno.started_at", 1, AttributeError),
+        ("data.sno.unknown", 1, TypeError),
+        ("data.paystubs.0.paid", "100", TypeError),
+        ("data.paystubs", {"period": "2026-01"}, TypeError),
+        ("data.metrics.upload_success_count", "12", TypeError),
+        ("data.metrics.upload_success_count", False, TypeError),
+        ("data.unknown", {}, KeyError),
+        ("data", [], AttributeError),
+        ("finished_paid", "many", ValueError),
+        ("finished_paid", 10**400, OverflowError),
+    ],
+)
+def test_load_invalid_node(path: str, value: Any, error: type[Exception]) -> None:
+    """Test that malformed nodes raise the errors the webhook turns into 400."""
+    node = _node()
+    _set(node, path, value)
+    with pytest.raises(error):
+        load_node(node)
+
+
+def test_load_node_without_status() -> None:
+    """Test that a node without its status is rejected."""
+    node = _node()
+    del node["data"]["sno"]
+    with pytest.raises(KeyError):
+        load_node(node)
+
+
+@pytest.mark.parametrize("node", [None, [], "node"])
+def test_load_node_not_object(node: Any) -> None:
+    """Test that a node must be an object."""
+    with pytest.raises(TypeError):
+        load_node(node)
+
+
+def test_check_record() -> None:
+    """Test the field types of a record."""
+    check_record(Paystub(period="2026-01", paid=1))
+    check_record(Paystub(period="2026-01", paid=1.5))
+    with pytest.raises(TypeError, match=r"Paystub\.paid"):
+        check_record(Paystub(period="2026-01", paid=None))  # type: ignore[arg-type]
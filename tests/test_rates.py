@@ -0,0 +1,128 @@
+"""Tests of the throughput rates."""
+
+import pytest
+
+from custom_components.storj_node_statistics.derive import BYTES_PER_GB
+from custom_components.storj_node_statistics.rates import (
+    AVERAGE_WINDOW,
+    BANDWIDTH,
+    BYTES_PER_MEGABIT,
+    DISK_USED,
+    RATE_WINDOW,
+    CounterRing,
+    rate_values,
+)
+
+
+def _fill(ring: CounterRing, count: int, step: float) -> None:
+    """Add samples a tick apart, growing by step per second."""
+    for index in range(count):
+        timestamp = index * ring.tick
+        ring.add(timestamp, (step * timestamp, step * timestamp))
+
+
+def test_empty_and_single_sample() -> None:
+    """Test that a rate needs two samples."""
+    ring = CounterRing(60)
+    assert ring.rate(BANDWIDTH, RATE_WINDOW, counter=True) is None
+    ring.add(0, (100, 100))
+    assert ring.rate(BANDWIDTH, RATE_WINDOW, counter=True) is None
+
+
+def test_constant_rate() -> None:
+    """Test a constant rate over the current and the average window."""
+    ring = CounterRing(60)
+    _fill(ring, 120, 1000)
+    assert ring.rate(BANDWIDTH, RATE_WINDOW, counter=True) == pytest.approx(1000)
+    assert ring.rate(BANDWIDTH, AVERAGE_WINDOW, counter=True) == pytest.approx(1000)
+
+
+def test_window_excludes_older_samples() -> None:
+    """Test that only the samples of the window are used."""
+    ring = CounterRing(60)
+    # 1000 bytes/s for half an hour, then 3000 bytes/s for another half hour
+    for index in range(61):
+        timestamp = index * 60
+        value = 1000 * min(timestamp, 1800) + 3000 * max(timestamp - 1800, 0)
+        ring.add(timestamp, (value, value))
+    assert ring.rate(BANDWIDTH, RATE_WINDOW, counter=True) == pytest.approx(3000)
+    assert ring.rate(BANDWIDTH, AVERAGE_WINDOW, counter=True) == pytest.approx(2000)
+
+
+def test_window_spans_one_tick() -> None:
+    """Test that a window shorter than the tick spans the last tick."""
+    ring = CounterRing(3600)
+    ring.add(0, (0, 0))
+    ring.add(3600, (3600, 3600))
+    assert ring.rate(BANDWIDTH, RATE_WINDOW, counter=True) == pytest.approx(1)
+
+
+def test_timer_drift() -> None:
+    """Test that updates firing a little late keep the whole window."""
+    ring = CounterRing(60)
+    for index in range(20):
+        timestamp = index * 61.0
+        ring.add(timestamp, (timestamp, timestamp))
+    assert ring.rate(BANDWIDTH, RATE_WINDOW, counter=True) == pytest.approx(1)
+
+
+def test_counter_reset() -> None:
+    """Test that a counter starting over at month rollover keeps counting."""
+    ring = CounterRing(60)
+    for index, value in enumerate((100, 200, 50, 150)):
+        ring.add(index * 60, (value, value))
+    # 100 before the reset, 50 and then 100 after it
+    assert ring.rate(BANDWIDTH, RATE_WINDOW, counter=True) == pytest.approx(250 / 180)
+    # Disk usage is not a counter, it shrinks
+    assert ring.rate(DISK_USED, RATE_WINDOW, counter=False) == pytest.approx(50 / 180)
+
+
+def test_missing_values_skipped() -> None:
+    """Test that samples without a value are skipped."""
+    ring = CounterRing(60)
+    ring.add(0, (0, 0))
+    ring.add(60, (None, 60))
+    ring.add(120, (120, 120))
+    assert ring.rate(BANDWIDTH, RATE_WINDOW, counter=True) == pytest.approx(1)
+    ring = CounterRing(60)
+    ring.add(0, (None, 0))
+    ring.add(60, (None, 60))
+    assert ring.rate(BANDWIDTH, RATE_WINDOW, counter=True) is None
+
+
+def test_ring_wraps() -> None:
+    """Test that the oldest samples are overwritten once the ring is full."""
+    ring = CounterRing(60)
+    _fill(ring, 500, 2000)
+    assert ring._count == ring._capacity
+    assert ring.rate(BANDWIDTH, AVERAGE_WINDOW, counter=True) == pytest.approx(2000)
+
+
+def test_invalid_tick() -> None:
+    """Test that rings of back to back refreshes use the default tick."""
+    assert CounterRing(0).tick == CounterRing().tick > 0
+
+
+def test_rate_values() -> None:
+    """Test satellites sampled less often than the node status."""
+    status = CounterRing(60)
+    satellites = CounterRing(600)
+    # The month totals of the satellites summary only move every 10 minutes
+    for index in range(61):
+        timestamp = index * 60
+        status.add(timestamp, (1000 * timestamp, 500 * timestamp))
+        if timestamp % 600 == 0:
+            satellites.add(timestamp, (2000 * timestamp, 4000 * timestamp))
+    values = rate_values(status, satellites)
+    assert values["storj_ingress_rate"] == round(2000 / BYTES_PER_MEGABIT, 3)
+    assert values["storj_ingress_rate_average"] == round(2000 / BYTES_PER_MEGABIT, 3)
+    assert values["storj_egress_rate"] == round(4000 / BYTES_PER_MEGABIT, 3)
+    assert values["storj_bandwidth_rate"] == round(1000 / BYTES_PER_MEGABIT, 3)
+    assert values["storj_disk_fill_rate"] == round(500 * 86400 / BYTES_PER_GB, 2)
+
+
+def test_rate_values_empty() -> None:
+    """Test the values before any sample was taken."""
+    values = rate_values(CounterRing(60), CounterRing(600))
+    assert values["storj_ingress_rate"] is None
+    assert values["storj_disk_fill_rate"] is None
@@ -0,0 +1,104 @@
+"""Tests of the threshold and transition rules."""
+
+import pytest
+
+from custom_components.storj_node_statistics.rules import (
+    EVENT_THRESHOLD,
+    EVENT_TRANSITION,
+    Rule,
+    RuleEngine,
+    parse_rule,
+)
+
+SATELLITE = "12EayRS2V1kEsWESU9QMRseFhdxYxKicsiFmxrsLZHeLUtdps3S"
+
+
+def test_parse_rule() -> None:
+    """Test parsing threshold and transition rules."""
+    assert parse_rule(" storj_disk_use_percentage >= 95.5 ") == Rule(
+        text="storj_disk_use_percentage >= 95.5",
+        key="storj_disk_use_percentage",
+        operator=">=",
+        threshold=95.5,
+    )
+    assert parse_rule("storj_version changed") == Rule(
+        text="storj_version changed", key="storj_version"
+    )
+    assert parse_rule("storj_total_held < -1").threshold == -1
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "storj_version", "storj_version == 1", "Storj_version > 1", "x > y"],
+)
+def test_parse_invalid_rule(text: str) -> None:
+    """Test that malformed rules are rejected."""
+    with pytest.raises(ValueError, match=text):
+        parse_rule(text)
+
+
+def test_threshold() -> None:
+    """Test that crossing a threshold fires once in each direction."""
+    engine = RuleEngine("node", [parse_rule("storj_disk_use_percentage > 90")])
+    key = "storj_disk_use_percentage"
+    # The first value is only remembered, even beyond the threshold
+    assert engine.check({key: 95}, {key}) == []
+    assert engine.check({key: 80}, {key}) == [
+        (
+            EVENT_THRESHOLD,
+            {
+                "node": "node",
+                "key": key,
+                "rule": "storj_disk_use_percentage > 90",
+                "value": 80,
+                "previous": 95,
+                "active": False,
+            },
+        )
+    ]
+    assert engine.check({key: 85}, {key}) == []
+    events = engine.check({key: 91}, {key})
+    assert [event[1]["active"] for event in events] == [True]
+    # Values that are not numbers are never beyond the threshold
+    events = engine.check({key: None}, {key})
+    assert [event[1]["active"] for event in events] == [False]
+
+
+def test_transition() -> None:
+    """Test that a watched value fires on every change."""
+    engine = RuleEngine("node", [parse_rule("storj_version changed")])
+    assert engine.check({"storj_version": "1.1"}, {"storj_version"}) == []
+    events = engine.check({"storj_version": "1.2"}, {"storj_version"})
+    assert events == [
+        (
+            EVENT_TRANSITION,
+            {
+                "node": "node",
+                "key": "storj_version",
+                "rule": "storj_version changed",
+                "value": "1.2",
+                "previous": "1.1",
+            },
+        )
+    ]
+
+
+def test_only_changed_keys() -> None:
+    """Test that values outside the changed keys are not checked."""
+    engine = RuleEngine("node", [parse_rule("storj_wallet changed")])
+    engine.check({"storj_wallet": "a"}, {"storj_wallet"})
+    assert engine.check({"storj_wallet": "b"}, {"storj_version"}) == []
+    assert len(engine.check({"storj_wallet": "b"}, {"storj_wallet"})) == 1
+    assert RuleEngine("node", []).check({"storj_wallet": "c"}, {"storj_wallet"}) == []
+
+
+def test_satellite_rules() -> None:
+    """Test that a satellite sensor rule applies to every satellite."""
+    engine = RuleEngine("node", [parse_rule("storj_satellite_audit < 0.96")])
+    assert engine.keys == {"storj_satellite_audit"}
+    key = f"storj_satellite_audit_{SATELLITE}"
+    unknown = "storj_satellite_audit_unknown"
+    values = {key: 1.0, unknown: 1.0}
+    engine.check(values, {key, unknown}, {SATELLITE})
+    events = engine.check({key: 0.95, unknown: 0.5}, {key, unknown}, {SATELLITE})
+    assert [(event[1]["key"], event[1]["active"]) for event in events] == [(key, True)]